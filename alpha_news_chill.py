@@ -6,19 +6,700 @@ Enhanced Alpha Vantage News Generator with Style Selection System
 - Style-specific content generation
 """
 
+import functools
+import hashlib
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import math
+import numbers
 import pandas as pd
-from datetime import datetime, timedelta
+from openpyxl import load_workbook
+from datetime import date, datetime, timedelta
+from collections import Counter
+from operator import itemgetter
 from typing import Dict, List, Any, Optional, Tuple
 import os
+import re
+import sys
+import httpx
 from dotenv import load_dotenv
 from openai import OpenAI
+import threading
 import time
+import zipfile
+from xml.sax.saxutils import escape as _xml_escape
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# yfinance is optional; without it the market data helpers return their empty results
+try:
+    import yfinance as yf
+except ImportError:
+    yf = None
+
+# ijson lets the news feed be filtered while it downloads; without it the whole body is parsed first
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# orjson parses feeds and model replies several times faster; errors subclass json.JSONDecodeError
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 # Load environment variables
 load_dotenv()
 
+# Polars is opt-in (USE_POLARS=1) for loading the tracker log; importing it is not free
+pl = None
+if os.getenv('USE_POLARS', '').lower() in ('1', 'true', 'yes'):
+    try:
+        import polars as pl
+    except ImportError:
+        print("⚠️ USE_POLARS is set but polars is not installed - using the standard log loader")
+
+# ===== Significance Filter Lists =====
+# Major company earnings are OK in headlines if from reputable sources
+_HEADLINE_MAJOR_COMPANIES = frozenset({
+    'apple', 'microsoft', 'google', 'amazon', 'tesla', 'nvidia',
+    'meta', 'netflix', 'adobe', 'oracle', 'salesforce'
+})
+
+# Major tech names whose earnings get a priority bonus
+_EARNINGS_MAJOR_COMPANIES = frozenset({
+    'apple', 'microsoft', 'google', 'amazon', 'tesla', 'nvidia'
+})
+
+# STRICT EXCLUSIONS for news fed to content generation
+_FINANCIAL_EXCLUSIONS = [
+    # Legal/spam content
+    'shareholder alert', 'class action', 'lawsuit', 'attorney', 'investigation',
+    'legal notice', 'court', 'settlement', 'plaintiff', 'damages', 'reminds investors',
+    'law firm', 'securities fraud', 'kahn swick', 'losses in excess',
+    
+    # Corporate filing spam
+    'announces grant', 'stock options', 'reverse stock split', 'stock split',
+    'dividend announcement', 'board of directors', 'executive appointment',
+    
+    # Retrospective/analysis spam
+    'if you invested', 'you would have', 'outperformed', '5 years ago',
+    'strong buy', 'trending stocks', 'stocks for your', 'zacks rank',
+    
+    # Generic content
+    '3 stocks', '5 stocks', 'top stocks', 'stocks to buy', 'stocks to watch'
+]
+
+# POSITIVE INDICATORS for quality financial content
+_FINANCIAL_QUALITY_INDICATORS = [
+    # Market movements and data
+    'earnings', 'revenue', 'profit', 'guidance', 'outlook', 'beats', 'misses',
+    'market', 'trading', 'price', 'rally', 'surge', 'falls', 'drops',
+    
+    # Economic indicators
+    'fed', 'federal reserve', 'interest rate', 'inflation', 'gdp', 'employment',
+    'economic data', 'consumer confidence', 'retail sales', 'manufacturing',
+    
+    # Sectors and commodities
+    'energy', 'technology', 'healthcare', 'financials', 'oil prices', 'gold',
+    'cryptocurrency', 'bitcoin', 'ethereum', 'bonds', 'treasury', 'currency',
+    
+    # Major market events
+    'ipo', 'merger', 'acquisition', 'partnership', 'deal', 'contract'
+]
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _title_tokens(title: str) -> frozenset:
+    """Split a lowercased title into a set of word tokens for exact name lookups"""
+    return frozenset(_WORD_RE.findall(title))
+
+
+# ===== Priority Scoring Tables =====
+# Bonus added once per category, however many of its keywords a title matches
+_PRIORITY_WEIGHTS = {
+    'forex_critical': 160,
+    'geopolitical': 140,
+    'forex_market': 120,
+    'market_events': 80,
+    'sector_news': 60
+}
+
+_PRIORITY_KEYWORDS = {
+    'forex_critical': [
+        'federal reserve', 'fed meeting', 'fomc', 'interest rate', 'monetary policy',
+        'ecb', 'boe', 'boj', 'snb', 'rba', 'boc', # International Central Banks
+        'cpi', 'inflation data', 'non-farm payrolls', 'nfp', # Top-tier data
+        'jobs report', 'gdp', 'unemployment', 'hawkish', 'dovish'
+    ],
+    # GEOPOLITICAL EVENTS - major market-moving news
+    'geopolitical': [
+        'geopolitical', 'trade war', 'tariffs', 'sanctions', 'election', 
+        'summit', 'opec', 'brexit'
+    ],
+    # FOREX & BOND MARKET MOVEMENT - currency and bond market volatility
+    'forex_market': [
+        'dollar', 'euro', 'yen', 'pound', 'currency', 'risk-on', 'risk-off', 
+        'safe-haven', 'bond yields', 'yield curve', 'treasury'
+    ],
+    # General Stock Market Movements
+    'market_events': [
+        'record high', 'all-time high', 'market rally', 'market surge',
+        'dow hits', 'nasdaq reaches', 's&p 500', 'correction', 'sell-off'
+    ],
+    # Sector/Commodity News
+    'sector_news': [
+        'oil prices', 'crude oil', 'energy sector', 'tech sector',
+        'banking sector', 'financials'
+    ]
+}
+
+
+def _compile_terms(terms) -> re.Pattern:
+    """Compile a keyword list into one substring-matching alternation"""
+    return re.compile('|'.join(re.escape(term) for term in terms))
+
+
+class _KeywordMatcher:
+    """Report which keyword categories occur as substrings of a text.
+
+    Uses a single Aho-Corasick pass over the text when pyahocorasick is
+    installed, otherwise one precompiled regex search per category.
+    """
+
+    def __init__(self, categories: Dict[str, List[str]]):
+        self._automaton = None
+        self._patterns = {}
+        
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for category, terms in categories.items():
+                for term in terms:
+                    # A term may belong to several categories
+                    self._automaton.add_word(term, self._automaton.get(term, ()) + (category,))
+            self._automaton.make_automaton()
+        else:
+            self._patterns = {category: _compile_terms(terms) for category, terms in categories.items()}
+
+    def categories(self, text: str) -> set:
+        if self._automaton is not None:
+            hits = set()
+            for _, term_categories in self._automaton.iter(text):
+                hits.update(term_categories)
+            return hits
+        return {category for category, pattern in self._patterns.items() if pattern.search(text)}
+
+
+# Whole-feed column scans in _filter_quality_articles
+_FINANCIAL_EXCLUSION_RE = _compile_terms(_FINANCIAL_EXCLUSIONS)
+_FINANCIAL_QUALITY_RE = _compile_terms(_FINANCIAL_QUALITY_INDICATORS)
+
+_PRIORITY_MATCHER = _KeywordMatcher(_PRIORITY_KEYWORDS)
+
+
+def _iter_feed_items(raw, notices: Dict[str, str]):
+    """Yield NEWS_SENTIMENT feed articles from a byte stream as each one finishes parsing.
+
+    Top-level string fields (e.g. 'Note', 'Error Message') are recorded in notices.
+    """
+    builder = None
+    for prefix, event, value in ijson.parse(raw, use_float=True):
+        if prefix == 'feed.item' and event == 'start_map':
+            builder = ijson.ObjectBuilder()
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == 'feed.item' and event == 'end_map':
+                yield builder.value
+                builder = None
+        elif event == 'string' and '.' not in prefix:
+            notices[prefix] = value
+
+
+# ===== Market Data Cache =====
+# Shared by all generator instances so every style run in a session reuses one fetch
+_MARKET_CACHE: Dict[Tuple[str, tuple, str, int], Any] = {}
+# Generators in other threads (Streamlit sessions, parallel fetches) read and sweep the same dict
+_MARKET_CACHE_LOCK = threading.Lock()
+
+
+def _market_cache(ttl_seconds: int):
+    """Memoize a market-data method per arguments, trading day and ttl_seconds bucket, skipping errors"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args):
+            bucket = int(time.time() // ttl_seconds)
+            key = (method.__name__, args, date.today().isoformat(), bucket)
+            with _MARKET_CACHE_LOCK:
+                if key in _MARKET_CACHE:
+                    return _MARKET_CACHE[key]
+            
+            # Fetched outside the lock so one slow request doesn't hold up other lookups
+            result = method(self, *args)
+            if result and not (isinstance(result, dict) and result.get('status') == 'error'):
+                with _MARKET_CACHE_LOCK:
+                    # Drop this method's expired buckets before storing the fresh one
+                    for stale_key in [k for k in _MARKET_CACHE if k[0] == method.__name__ and k[2:] != key[2:]]:
+                        del _MARKET_CACHE[stale_key]
+                    _MARKET_CACHE[key] = result
+            return result
+        return wrapper
+    return decorator
+
+
+# ===== OpenAI Client Settings =====
+_OPENAI_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+_OPENAI_LIMITS = httpx.Limits(max_keepalive_connections=10, max_connections=20)
+
+# The longest style (85s script + social + motion + caption + title) fits well inside this
+_MAX_COMPLETION_TOKENS = 800
+
+
+def _stream_delta(chunk) -> str:
+    """Text carried by one streamed completion chunk"""
+    if chunk.choices and chunk.choices[0].delta.content:
+        return chunk.choices[0].delta.content
+    return ""
+
+
+def _could_be_json_object(text: str) -> bool:
+    """False once a streamed reply clearly isn't a JSON object, so the stream can be cut short"""
+    stripped = text.lstrip()
+    return not stripped or stripped[0] == "{"
+
+# ===== Prompt Constants =====
+# Kept byte-identical across calls (no dates or style fields) so OpenAI's
+# automatic prompt caching can reuse it; per-call details go in the user turn.
+_SYSTEM_PROMPT = """You are an expert global market analyst creating content for a sophisticated financial audience. Your primary goal is to identify and report on the most impactful news driving global markets.
+
+PRIORITIZATION HIERARCHY:
+1.  **Top Priority:** Major economic data releases (Inflation/CPI, GDP, Jobs/NFP) from G7 nations.
+2.  **High Priority:** Central bank announcements (Fed, ECB, BoE, BoJ) and significant geopolitical events.
+3.  **Medium Priority:** Major M&A deals and significant, confirmed corporate news.
+4.  **Lower Priority:** Market speculation, rumors, and analyst commentary.
+
+Your task is to select the top 3 most important stories from the provided context based on this hierarchy and build the script around them.
+
+VOICE-FRIENDLY RULES:
+- NEVER write ticker symbols that will be read aloud (e.g., $AAPL, FOREX:USD, CRYPTO:BTC)
+- Use company/asset names: "Apple", "US Dollar", "Bitcoin"
+- For unknown tickers, use generic terms: "the company", "related stocks", "cryptocurrency markets"
+- Only use ticker symbols in parentheses if they add clarity
+
+SCRIPT RULES:
+- EXACTLY 3 STORIES with varied, natural transitions
+- VOICE-FRIENDLY: Use company names, not ticker symbols
+- EXCLUDE: Legal notices, shareholder alerts, class action lawsuits
+- FOCUS: Market movements, earnings, economic policy, sector trends
+
+SOCIAL POST REQUIREMENTS:
+- 60-90 words, professional LinkedIn/X audience
+- Strong opening, 2-3 bullet points, concluding thought
+- Include 2-3 relevant tickers or figures
+- NO emojis, 3-4 hashtags like #MarketUpdate #Investing
+
+MOTION SCRIPT (300 chars max):
+- Professional body language directions
+- Opening stance, gestures, transitions, closing
+
+VIDEO CAPTION (60-80 chars):
+- Professional video title with date and key topics"""
+
+# Generated fields in the order the content tuples use them
+_CONTENT_FIELDS = ("script", "social", "motion", "caption", "title")
+
+# Allowed character counts, checked in this order; the script minimum scales with target_seconds
+_CONTENT_BOUNDS = {
+    "caption": (20, 100),
+    "motion": (50, 350),
+    "social": (150, 800)
+}
+
+# Structured output schema; the API enforces the reply shape, so the prompt no longer spells it out
+_SCRIPT_SCHEMA = {
+    "name": "ScriptOut",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "script": {"type": "string"},
+            "social": {"type": "string"},
+            "motion": {"type": "string"},
+            "caption": {"type": "string"},
+            "title": {"type": "string"}
+        },
+        "required": list(_CONTENT_FIELDS),
+        "additionalProperties": False
+    }
+}
+
+# Built prompts kept per generator; plenty for every style across a day's re-runs
+_PROMPT_CACHE_SIZE = 64
+
+# Per-call user prompt pieces; fixed text lives here, only the fields are filled per call
+_BASE_REQUIREMENTS_TEMPLATE = """
+    CONTEXT:
+    {context}
+
+    SCRIPT REQUIREMENTS:
+    - {target_seconds} seconds when spoken at news pace (~{target_words} words)
+    - TARGET LENGTH: Aim for {target_words} words minimum
+
+    THEME: {theme}
+    """
+
+_CLASSIC_DAILY_PROMPT = """Create a 'Classic Daily Brief' script that is punchy, insightful, and tells a story about the market today.
+
+    CRITICAL INSTRUCTIONS:
+    1.  **Find the Narrative:** Don't just list news. Find the connecting theme. Is today about inflation fears? A tech rebound? Geopolitical tension? State this theme upfront.
+    2.  **Answer "So What?":** For each story, immediately explain its impact. Why should a regular investor care? Use phrases that connect news to personal impact (e.g., "which could mean...", "the big risk here is...").
+    3.  **Use a Conversational Hook:** Start with a question or a bold statement, not just "Here's your update."
+
+    TEMPLATE / STRUCTURE:
+    "[Engaging Hook related to the day's theme]. Let's break down what's really moving the markets.
+    First up, the biggest story: [STORY 1, explaining its direct market impact].
+    Next, keep an eye on this: [STORY 2, explaining what it signals for the future].
+    And finally, a move under the radar: [STORY 3, and why it matters].
+    So, the big picture today is [reiterate the main theme]. That's your rundown — see you tomorrow!"
+
+    EXAMPLE STYLE (This is the tone to aim for):
+    "So, is the market finally getting nervous about inflation? Let's break down what's really moving the markets.
+    First up, the biggest story: The Fed just signaled that rate cuts might be further away than we thought, which sent a shockwave through the tech sector.
+    Next, keep an eye on this: Oil prices are spiking above $95 a barrel. For you, that could mean more pain at the gas pump very soon.
+    And finally, a move under the radar: A major corporate Bitcoin purchase just hit the wires, showing big institutions are still betting on crypto long-term.
+    So, the big picture today is caution. The market is weighing inflation risks against corporate confidence. That's your rundown — see you tomorrow!"
+
+    KEY PHRASES TO USE:
+    - "Let's break down what's really moving the markets."
+    - "The big picture today is..."
+    - "For you, that could mean..."
+    - "Keep an eye on this..."
+
+    {base_requirements}"""
+
+_BREAKING_ALERT_PROMPT = """Create a Breaking News Alert script following this URGENT template:
+
+    TEMPLATE:
+    "BREAKING NEWS for your market update. First, [URGENT STORY with immediate impact]. 
+    JUST IN — [SECOND BREAKING STORY with dramatic element]. And finally — [THIRD STORY with critical level]. 
+    All eyes are on what happens next. That's your breaking update — more as it develops."
+
+    EXAMPLE STYLE:
+    "BREAKING NEWS for your market update. First, the Fed just signaled a surprise policy shift, sending tech stocks tumbling. 
+    JUST IN — NVIDIA shares are halted pending a major announcement, sparking sector-wide volatility. 
+    And finally — Bitcoin has just breached a critical support level at $115,000. 
+    All eyes are on what happens next. That's your breaking update — more as it develops."
+
+    KEY PHRASES TO USE:
+    - "BREAKING NEWS"
+    - "JUST IN"
+    - "sparking sector-wide volatility"
+    - "critical support/resistance level"
+    - "All eyes are on what happens next"
+
+    {base_requirements}"""
+
+_WEEKLY_DEEP_PROMPT = """Create a TRUE Weekly Deep Dive script following this ANALYTICAL template:
+
+    IMPORTANT: This is a WEEKLY ANALYSIS covering Monday through Friday, NOT daily news.
+
+    TEMPLATE:
+    "Here is your weekly market analysis. The primary catalyst this week was [WEEKLY THEME from context], which [WEEKLY MARKET IMPACT and performance]. 
+    In corporate developments, [MAJOR CORPORATE STORY from the week with broader implications]. 
+    Looking ahead, the key data point will be [UPCOMING WEEK'S FOCUS]. The street is anticipating [NEXT WEEK'S EXPECTATION]. 
+    This has been your weekly market analysis."
+
+    WEEKLY CONTEXT PROVIDED:
+    {weekly_info}
+
+    WEEKLY LANGUAGE REQUIREMENTS:
+    - Use "this week" not "today" 
+    - Reference week-long trends: "throughout the week", "over five trading days"
+    - Mention weekly performance: "the S&P gained X% for the week"
+    - Use past tense for the week's events: "dominated this week", "emerged as"
+    - Forward-looking: "heading into next week", "the week ahead"
+
+    EXAMPLE WEEKLY STYLE:
+    "Here is your weekly market analysis. The primary catalyst this week was Federal Reserve uncertainty, which created sustained volatility across all major indices with the S&P 500 gaining 1.8% for the week despite Tuesday's selloff.
+    In corporate developments, the energy sector dominated headlines with three major oil companies reporting record quarterly profits, underscoring the sector's resilience amid geopolitical tensions. 
+    Looking ahead, the key data point will be next week's inflation data release. The street is anticipating this could determine the Fed's December policy stance.
+    This has been your weekly market analysis."
+
+    KEY WEEKLY PHRASES TO USE:
+    - "The primary catalyst this week was..."
+    - "throughout the trading week"
+    - "dominated headlines this week"
+    - "over the five-day period"
+    - "heading into next week"
+    - "This has been your weekly market analysis"
+
+    {base_requirements}"""
+
+_MARKET_PULSE_PROMPT = """Create a Market Pulse script following this ENERGETIC template:
+
+    TEMPLATE:
+    "Time for your market pulse check! [SECTOR/ASSET] is [ACTION VERB] today on [CATALYST]. 
+    Meanwhile, [CONTRASTING STORY] as traders [REACTION]. The mood on the street? [SENTIMENT]. 
+    Here's what's driving the action: [KEY FACTORS]. Your market pulse — [CURRENT STATE] with [OUTLOOK]. Keep watching!"
+
+    KEY ACTION VERBS TO USE:
+    - surging, plunging, rallying, retreating, soaring, tumbling, spiking, diving
+
+    KEY PHRASES TO USE:
+    - "Time for your market pulse check!"
+    - "Meanwhile"
+    - "The mood on the street?"
+    - "Here's what's driving the action:"
+    - "Your market pulse —"
+    - "Keep watching!"
+
+    TONE: Energetic, rhythmic, engaging with momentum-focused language
+
+    {base_requirements}"""
+
+_FOREX_BRIEFING_PROMPT = """Create a Forex Daily Briefing script focusing on actual currency market impact:
+
+        CRITICAL INSTRUCTIONS:
+        - Analyze the provided news context for stories that affect major currencies
+        - Focus ONLY on G7 currencies: USD, EUR, JPY, GBP, CAD, AUD, CHF
+        - If economic data is mentioned, explain its currency impact
+        - If no forex-relevant news exists, create a brief summary acknowledging limited forex developments
+        - Use specific currency pair names (EUR/USD, GBP/JPY, etc.) only when justified by the news
+        - Do NOT use placeholder examples or generic statements
+
+        TEMPLATE STRUCTURE (adapt based on actual news):
+        "Here is your forex daily briefing for {current_date}. [Analyze actual news for currency impacts]
+        [Connect specific news to currency movements]
+        [Mention any relevant central bank developments]
+        Looking ahead, [mention actual upcoming events if any]. That's your forex briefing — trade safe."
+
+        AVOID:
+        - Generic examples like "testing 1.10 resistance"
+        - Placeholder currency pairs when news doesn't support them
+        - Making up economic data releases not mentioned in context
+
+        {base_requirements}"""
+
+_STRATEGIC_OUTLOOK_PROMPT = """Create a Strategic Outlook script following this INSTITUTIONAL template:
+
+    TEMPLATE:
+    "Your strategic market briefing: [MACRO CONTEXT] is reshaping [MARKET/SECTOR] dynamics. 
+    From a strategic standpoint, [INSTITUTIONAL PERSPECTIVE with risk/reward analysis]. 
+    On the tactical side, watch for [SPECIFIC LEVELS/EVENTS] as potential inflection points. 
+    Our take: [STRATEGIC RECOMMENDATION] while monitoring [KEY RISKS]. Strategic briefing complete — position accordingly."
+
+    KEY INSTITUTIONAL PHRASES TO USE:
+    - "Your strategic market briefing:"
+    - "From a strategic standpoint..."
+    - "The risk-reward equation suggests..."
+    - "On the tactical side..."
+    - "Our take:"
+    - "as potential inflection points"
+    - "Strategic briefing complete — position accordingly"
+
+    TONE: Advisory, measured, institutional with strategic perspective
+
+    {base_requirements}"""
+
+
+_STYLE_PROMPTS = {
+    "classic_daily": _CLASSIC_DAILY_PROMPT,
+    "breaking_alert": _BREAKING_ALERT_PROMPT,
+    "weekly_deep": _WEEKLY_DEEP_PROMPT,
+    "market_pulse": _MARKET_PULSE_PROMPT,
+    "forex_briefing": _FOREX_BRIEFING_PROMPT,
+    "strategic_outlook": _STRATEGIC_OUTLOOK_PROMPT
+}
+
+
+def _format_style_brief(style_config: Dict[str, Any]) -> str:
+    """Per-style system message sent after the shared _SYSTEM_PROMPT prefix"""
+    return f"""SELECTED STYLE: {style_config['name']}
+DESCRIPTION: {style_config['description']}
+TONE: {style_config['tone']}
+PACING: {style_config['pacing']}
+TARGET LENGTH: {style_config['target_seconds']} seconds"""
+
+
+# ===== Excel Tracker Layout =====
+_CONTENT_LOG_COLUMNS = [
+    'Date', 'Time', 'Day', 'Content_Type', 'Style', 'Script', 'Social_Post',
+    'Motion_Script', 'Video_Caption', 'Episode_Title', 'Script_Length', 'Word_Count', 
+    'News_Count', 'Market_Data', 'Quality_Score'
+]
+
+
+# Column types for reading the JSONL log with Polars
+_NUMERIC_LOG_COLUMNS = frozenset({'Script_Length', 'Word_Count', 'News_Count'})
+
+
+def _format_market_data(market_data: Optional[Dict[str, Any]]) -> str:
+    """Market_Data column text for a snapshot, blank unless it is connected"""
+    if market_data and market_data.get('status') == 'connected':
+        return f"SPY: {market_data['price']} ({market_data['change']})"
+    return ""
+
+
+def _empty_log_columns() -> Dict[str, List[Any]]:
+    """Column buffers for the Content_Log, appended to one value per entry"""
+    return {name: [] for name in _CONTENT_LOG_COLUMNS}
+
+
+# Low-cardinality Content_Log columns stored once in the shared-string table
+_SHARED_LOG_COLUMNS = frozenset(
+    _CONTENT_LOG_COLUMNS.index(name) for name in ('Date', 'Day', 'Content_Type', 'Style', 'Quality_Score')
+)
+
+
+# ===== Raw XLSX Writer =====
+# The tracker sheets hold plain values only, so the workbook parts are written
+# straight into the zip instead of going through a spreadsheet library's cell model
+_XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_SPREADSHEET_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_RELATIONSHIP_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_PACKAGE_RELS_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+_OFFICE_CT = 'application/vnd.openxmlformats-officedocument.spreadsheetml'
+
+_XLSX_ROOT_RELS = (
+    f'{_XML_HEADER}<Relationships xmlns="{_PACKAGE_RELS_NS}">'
+    f'<Relationship Id="rId1" Type="{_RELATIONSHIP_NS}/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_XLSX_STYLES = (
+    f'{_XML_HEADER}<styleSheet xmlns="{_SPREADSHEET_NS}">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1" applyAlignment="1">'
+    '<alignment horizontal="center"/></xf></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+# Header cells all point at the one bold, centred format above (cellXfs index 1)
+_HEADER_STYLE_ATTR = ' s="1"'
+
+# Fixed column width instead of sizing each column to its contents
+_XLSX_COLUMN_WIDTH = 18
+
+# zlib level for the package; the sheets are repetitive text, so level 1 gives a
+# slightly larger file for a fraction of the CPU the default level 6 spends per save
+_XLSX_COMPRESSLEVEL = 1
+
+# Control characters XML 1.0 cannot carry
+_XML_ILLEGAL_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# Tracker sheets are all narrower than 26 columns
+_COLUMN_LETTERS = [chr(ord('A') + i) for i in range(26)]
+
+
+def _xml_text(value: str) -> str:
+    return _xml_escape(_XML_ILLEGAL_RE.sub('', value))
+
+
+def _xlsx_sheet_xml(rows, shared_strings: Optional[Dict[str, int]] = None, shared_cols=frozenset()) -> str:
+    """Worksheet XML for rows of plain values; strings in shared_cols go to the shared-string table"""
+    # First row is the header: frozen in place and drawn with the shared header format
+    parts = [
+        f'{_XML_HEADER}<worksheet xmlns="{_SPREADSHEET_NS}">'
+        '<sheetViews><sheetView workbookViewId="0">'
+        '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+        '</sheetView></sheetViews>'
+    ]
+    if rows:
+        parts.append(f'<cols><col min="1" max="{len(rows[0])}" width="{_XLSX_COLUMN_WIDTH}" customWidth="1"/></cols>')
+    parts.append('<sheetData>')
+    for row_num, row in enumerate(rows, 1):
+        style = _HEADER_STYLE_ATTR if row_num == 1 else ''
+        parts.append(f'<row r="{row_num}">')
+        for col, value in enumerate(row):
+            if value is None or value == '':
+                continue
+            ref = f'{_COLUMN_LETTERS[col]}{row_num}'
+            if isinstance(value, bool):
+                parts.append(f'<c r="{ref}"{style} t="b"><v>{int(value)}</v></c>')
+            elif isinstance(value, numbers.Number) and math.isfinite(value):
+                parts.append(f'<c r="{ref}"{style}><v>{value}</v></c>')
+            elif shared_strings is not None and col in shared_cols:
+                index = shared_strings.setdefault(str(value), len(shared_strings))
+                parts.append(f'<c r="{ref}"{style} t="s"><v>{index}</v></c>')
+            else:
+                parts.append(f'<c r="{ref}"{style} t="inlineStr"><is><t xml:space="preserve">{_xml_text(str(value))}</t></is></c>')
+        parts.append('</row>')
+    parts.append('</sheetData></worksheet>')
+    return ''.join(parts)
+
+
+def _write_xlsx_raw(filename: str, sheets: Dict[str, Any], shared_columns: Optional[Dict[str, frozenset]] = None) -> None:
+    """Write {sheet name: rows} as a minimal .xlsx package.
+
+    A sheet given as bytes is taken as already-rendered worksheet XML.
+    shared_columns maps a sheet name to the column indexes whose strings
+    repeat enough to be worth storing once in sharedStrings.xml.
+    """
+    shared_columns = shared_columns or {}
+    shared_strings: Dict[str, int] = {}
+    names = list(sheets)
+    
+    content_types = [
+        f'{_XML_HEADER}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        f'<Override PartName="/xl/workbook.xml" ContentType="{_OFFICE_CT}.sheet.main+xml"/>'
+        f'<Override PartName="/xl/styles.xml" ContentType="{_OFFICE_CT}.styles+xml"/>'
+        f'<Override PartName="/xl/sharedStrings.xml" ContentType="{_OFFICE_CT}.sharedStrings+xml"/>'
+    ]
+    workbook = [f'{_XML_HEADER}<workbook xmlns="{_SPREADSHEET_NS}" xmlns:r="{_RELATIONSHIP_NS}"><sheets>']
+    workbook_rels = [f'{_XML_HEADER}<Relationships xmlns="{_PACKAGE_RELS_NS}">']
+    for sheet_id, name in enumerate(names, 1):
+        content_types.append(f'<Override PartName="/xl/worksheets/sheet{sheet_id}.xml" ContentType="{_OFFICE_CT}.worksheet+xml"/>')
+        workbook.append(f'<sheet name="{_xml_text(name)}" sheetId="{sheet_id}" r:id="rId{sheet_id}"/>')
+        workbook_rels.append(f'<Relationship Id="rId{sheet_id}" Type="{_RELATIONSHIP_NS}/worksheet" Target="worksheets/sheet{sheet_id}.xml"/>')
+    content_types.append('</Types>')
+    workbook.append('</sheets></workbook>')
+    workbook_rels.append(
+        f'<Relationship Id="rId{len(names) + 1}" Type="{_RELATIONSHIP_NS}/styles" Target="styles.xml"/>'
+        f'<Relationship Id="rId{len(names) + 2}" Type="{_RELATIONSHIP_NS}/sharedStrings" Target="sharedStrings.xml"/>'
+        '</Relationships>'
+    )
+    
+    # Build beside the live tracker and swap it in, so a failed write never truncates it
+    tmp_path = filename + '.tmp'
+    try:
+        with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=_XLSX_COMPRESSLEVEL) as zf:
+            zf.writestr('[Content_Types].xml', ''.join(content_types))
+            zf.writestr('_rels/.rels', _XLSX_ROOT_RELS)
+            zf.writestr('xl/workbook.xml', ''.join(workbook))
+            zf.writestr('xl/_rels/workbook.xml.rels', ''.join(workbook_rels))
+            zf.writestr('xl/styles.xml', _XLSX_STYLES)
+            for sheet_id, name in enumerate(names, 1):
+                sheet_xml = sheets[name]
+                if not isinstance(sheet_xml, bytes):
+                    sheet_xml = _xlsx_sheet_xml(sheet_xml, shared_strings, shared_columns.get(name, frozenset()))
+                zf.writestr(f'xl/worksheets/sheet{sheet_id}.xml', sheet_xml)
+            # Written last, once every sheet has registered its strings
+            zf.writestr('xl/sharedStrings.xml', ''.join([
+                f'{_XML_HEADER}<sst xmlns="{_SPREADSHEET_NS}" uniqueCount="{len(shared_strings)}">',
+                *(f'<si><t xml:space="preserve">{_xml_text(text)}</t></si>' for text in shared_strings),
+                '</sst>'
+            ]))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, filename)
+
 
 class ProfessionalNewsGenerator:
     def __init__(self, debug_mode=False):
@@ -32,22 +713,30 @@ class ProfessionalNewsGenerator:
             raise ValueError("OPENAI_API_KEY required in .env file")
 
         self.base_url = "https://www.alphavantage.co/query"
-        self.openai_client = OpenAI(api_key=self.openai_key)
-        self.call_count = 0
         
-        # Significance Filter Lists
-        self.MAJOR_COMPANIES = [
-            'apple', 'microsoft', 'google', 'amazon', 'tesla', 'nvidia', 'meta', 
-            'netflix', 'intel', 'amd', 'disney', 'nike', 'cocacola', 'pepsi',
-            'jpmorgan', 'goldman sachs', 'boeing', 'ford', 'exxon', 'chevron'
-        ]
+        # Keep-alive session for Alpha Vantage with backoff on rate limits and 5xx
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=4,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                              raise_on_status=False)
+        ))
+        
+        # Pooled HTTP/2 client so every generation call reuses one warm TLS connection
+        self._openai_http = httpx.Client(http2=True, timeout=_OPENAI_TIMEOUT, limits=_OPENAI_LIMITS)
+        self.openai_client = OpenAI(api_key=self.openai_key, http_client=self._openai_http)
+        self.call_count = 0
+        self._count_lock = threading.Lock()
         
-        self.HIGH_IMPACT_KEYWORDS = [
-            'fed', 'federal reserve', 'interest rate', 'inflation', 'gdp', 'cpi',
-            'jobs report', 'unemployment', 'trade war', 'tariffs', 'opec','gold',
-            'market rally', 'market surge', 'market falls', 'record high',
-            'dow', 'nasdaq', 's&p 500', 'oil prices', 'crude oil'
-        ]
+        # Generated content is appended to a JSONL log; the workbook is rebuilt from it on export
+        self.excel_path = "market_content_tracker.xlsx"
+        self.log_path = self.excel_path.replace(".xlsx", ".jsonl")
+        self._cols = None  # Content_Log columns (name -> values, oldest first); loaded on first save
+        self._stats = None  # Running Summary sheet aggregates over self._cols
+        self._log_seen = None  # _log_signature() as of the last load or append
+        self._headlines_fp = None  # Fingerprint of the headlines behind self._headlines_xml
+        self._headlines_xml = b''
         
         # Style guide definitions
         self.style_guide = {
@@ -94,20 +783,58 @@ class ProfessionalNewsGenerator:
         "pacing": "clear and concise"
             }
         }
+        
+        # Short style tails, built once; the long shared prefix is _SYSTEM_PROMPT
+        self._style_briefs = {key: _format_style_brief(config) for key, config in self.style_guide.items()}
+        self._prompt_cache: Dict[tuple, str] = {}
+        # Per-run dates live on the calling thread, so one instance can serve concurrent runs
+        self._run = threading.local()
+
+    def _start_run(self) -> None:
+        """Stamp the dates shared by one run's prompts and fallback content"""
+        now = datetime.now()
+        self._run.date = now.strftime('%B %d')
+        self._run.context_date = now.strftime('%B %d, %Y')
+
+    @property
+    def _run_date(self) -> str:
+        """This thread's run date, e.g. 'March 05'; stamped now if no run has started here"""
+        if not hasattr(self._run, 'date'):
+            self._start_run()
+        return self._run.date
+
+    @property
+    def _context_date(self) -> str:
+        """This thread's run date with the year, as shown in the prompt context"""
+        if not hasattr(self._run, 'context_date'):
+            self._start_run()
+        return self._run.context_date
+
+    def _count_call(self) -> None:
+        """Count one API request; runs on different threads may share this instance"""
+        with self._count_lock:
+            self.call_count += 1
+
+    def close(self) -> None:
+        """Release pooled HTTP connections"""
+        self._session.close()
+        self.openai_client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     # ===== Main Flow with Style Selection =====
     def generate_content(self, style_key="classic_daily") -> Dict[str, Any]:
         today = datetime.now().strftime('%A')
         print(f"📅 Generating {self.style_guide[style_key]['name']} content for {today}")
+        self._start_run()
 
-        if today == 'Monday':
-            return self._generate_monday(style_key)
-        elif today == 'Wednesday':
-            return self._generate_wednesday(style_key)
-        elif today == 'Friday':
-            return self._generate_friday(style_key)
-        else:
-            return self._generate_generic(style_key)
+        plan = self._plan_day(today)
+        outputs = self._generate_content_with_style(plan['news'], plan['day'], plan['theme'], style_key)
+        return self._build_content(plan, style_key, outputs)
     
     def get_available_styles(self) -> Dict[str, Dict]:
         """Return available styles with descriptions"""
@@ -117,36 +844,62 @@ class ProfessionalNewsGenerator:
             "target_seconds": style["target_seconds"]
         } for key, style in self.style_guide.items()}
 
+    @staticmethod
+    def script_stats(content: Dict[str, Any]) -> Tuple[int, int]:
+        """Return (characters, words) of the script, counted once and kept on the content dict"""
+        if '_word_count' not in content:
+            script = content.get('script', '')
+            content['_script_len'] = len(script)
+            content['_word_count'] = len(script.split())
+        return content['_script_len'], content['_word_count']
+
     # ===== Day Modes with Style Support =====
-    def _generate_monday(self, style_key):
-        news = self._get_high_quality_news(limit=8)
-        market_data = self._get_market_snapshot()
-        script, social_post, motion_script, video_caption, episode_title = self._generate_content_with_style(
-            news, "Monday", "Weekly market open with key developments", style_key
-        )
-        return {
-            'day': 'Monday',
-            'type': 'Weekly Market Open',
-            'style': self.style_guide[style_key]['name'],
-            'script': script,
-            'social_post': social_post,
-            'motion_script': motion_script,
-            'video_caption': video_caption,
-            'episode_title': episode_title,
-            'news_count': len(news),
-            'market_data': market_data,
-            'top_articles': news[:3]
-        }
+    def _plan_day(self, today: str) -> Dict[str, Any]:
+        """Fetch the news and market data for today's content mode"""
+        if today == 'Monday':
+            news = self._get_high_quality_news(limit=8)
+            return {
+                'day': 'Monday',
+                'type': 'Weekly Market Open',
+                'theme': "Weekly market open with key developments",
+                'news': news,
+                'extras': {'market_data': self._get_market_snapshot()}
+            }
+        elif today == 'Wednesday':
+            news = self._get_high_quality_news_timeframe(days_back=2, limit=10)
+            return {
+                'day': 'Wednesday',
+                'type': 'Mid-Week Analysis',
+                'theme': "Mid-week market analysis",
+                'news': news,
+                'extras': {'top_movers': self._get_recent_movers()}
+            }
+        elif today == 'Friday':
+            news = self._get_high_quality_news_timeframe(days_back=5, limit=12)
+            return {
+                'day': 'Friday',
+                'type': 'Weekly Market Wrap',
+                'theme': "Weekly market wrap-up",
+                'news': news,
+                'extras': {'weekly_summary': self._get_weekly_summary()}
+            }
+        else:
+            news = self._get_high_quality_news(limit=8)
+            return {
+                'day': today,
+                'type': 'Daily Market Update',
+                'theme': "Daily market update",
+                'news': news,
+                'extras': {'market_data': self._get_market_snapshot()}
+            }
 
-    def _generate_wednesday(self, style_key):
-        news = self._get_high_quality_news_timeframe(days_back=2, limit=10)
-        movers = self._get_recent_movers()
-        script, social_post, motion_script, video_caption, episode_title = self._generate_content_with_style(
-            news, "Wednesday", "Mid-week market analysis", style_key
-        )
-        return {
-            'day': 'Wednesday',
-            'type': 'Mid-Week Analysis',
+    def _build_content(self, plan: Dict[str, Any], style_key: str, outputs: Tuple[str, str, str, str, str]) -> Dict[str, Any]:
+        """Assemble the content dict for one style from the day plan and generated outputs"""
+        script, social_post, motion_script, video_caption, episode_title = outputs
+        news = plan['news']
+        content = {
+            'day': plan['day'],
+            'type': plan['type'],
             'style': self.style_guide[style_key]['name'],
             'script': script,
             'social_post': social_post,
@@ -154,57 +907,28 @@ class ProfessionalNewsGenerator:
             'video_caption': video_caption,
             'episode_title': episode_title,
             'news_count': len(news),
-            'top_movers': movers,
-            'top_articles': news[:3]
-        }
-
-    def _generate_friday(self, style_key):
-        news = self._get_high_quality_news_timeframe(days_back=5, limit=12)
-        weekly_summary = self._get_weekly_summary()
-        script, social_post, motion_script, video_caption, episode_title = self._generate_content_with_style(
-            news, "Friday", "Weekly market wrap-up", style_key
-        )
-        return {
-            'day': 'Friday',
-            'type': 'Weekly Market Wrap',
-            'style': self.style_guide[style_key]['name'],
-            'script': script,
-            'social_post': social_post,
-            'motion_script': motion_script,
-            'video_caption': video_caption,
-            'episode_title': episode_title,
-            'news_count': len(news),
-            'weekly_summary': weekly_summary,
-            'top_articles': news[:3]
-        }
-
-    def _generate_generic(self, style_key):
-        news = self._get_high_quality_news(limit=8)
-        market_data = self._get_market_snapshot()
-        script, social_post, motion_script, video_caption, episode_title = self._generate_content_with_style(
-            news, datetime.now().strftime('%A'), "Daily market update", style_key
-        )
-        return {
-            'day': datetime.now().strftime('%A'),
-            'type': 'Daily Market Update',
-            'style': self.style_guide[style_key]['name'],
-            'script': script,
-            'social_post': social_post,
-            'motion_script': motion_script,
-            'video_caption': video_caption,
-            'episode_title': episode_title,
-            'news_count': len(news),
-            'market_data': market_data,
+            **plan['extras'],
             'top_articles': news[:3]
         }
+        self.script_stats(content)
+        # Tracker column text, built here so repeated saves of this content just read it
+        content['_market_data_str'] = _format_market_data(content.get('market_data'))
+        return content
 
     # ===== Headlines Section - FIXED =====
+    @_market_cache(ttl_seconds=300)
+    def _headlines_cached(self, limit: int) -> List[Dict[str, Any]]:
+        """get_major_headlines reused for five minutes, so repeated saves skip the refetch"""
+        return self.get_major_headlines(limit)
+
     def get_major_headlines(self, limit=15) -> List[Dict[str, Any]]:
         """Get major market headlines with improved Gold/Bitcoin filtering"""
         print("📰 Fetching major market headlines...")
         
         # Get guaranteed Gold/Bitcoin headlines (quality focused)
         guaranteed_headlines = self._get_guaranteed_gold_bitcoin_headlines()
+        for headline in guaranteed_headlines:
+            headline['_score'] = self._get_priority_score(headline)
         
         # Get regular market headlines
         regular_headlines = self._get_regular_headlines(limit - len(guaranteed_headlines))
@@ -214,7 +938,7 @@ class ProfessionalNewsGenerator:
         final_headlines = self._remove_duplicate_headlines(all_headlines)
         
         # Sort by priority (market-moving news first)
-        final_headlines.sort(key=lambda x: self._get_priority_score(x), reverse=True)
+        final_headlines.sort(key=itemgetter('_score'), reverse=True)
         
         print(f"📊 Found {len(final_headlines)} major headlines ({len(guaranteed_headlines)} guaranteed Gold/Bitcoin)")
         return final_headlines[:limit]
@@ -237,20 +961,20 @@ class ProfessionalNewsGenerator:
             headlines = self._get_headlines_timeframe(days_back_start, days_back_end, limit=100)
             
             # Look for QUALITY Gold commodity news (if we don't have one)
-            gold_count = sum(1 for h in guaranteed if self._is_quality_gold_commodity_news(h))
+            gold_count = sum(1 for h in guaranteed if h['_is_gold'])
             if gold_count == 0:
                 for headline in headlines:
-                    if (self._is_quality_gold_commodity_news(headline) and 
+                    if (headline['_is_gold'] and 
                         self._is_quality_headline(headline)):
                         guaranteed.append(headline)
                         print(f"   🥇 Found quality Gold commodity news from {days_back_start}-{days_back_end} days ago")
                         break
             
             # Look for QUALITY Bitcoin/Crypto market news (if we don't have one)
-            bitcoin_count = sum(1 for h in guaranteed if self._is_quality_crypto_market_news(h))
+            bitcoin_count = sum(1 for h in guaranteed if h['_is_crypto'])
             if bitcoin_count == 0 and len(guaranteed) < limit:
                 for headline in headlines:
-                    if (self._is_quality_crypto_market_news(headline) and 
+                    if (headline['_is_crypto'] and 
                         self._is_quality_headline(headline) and
                         not any(self._headlines_similar(headline, existing) for existing in guaranteed)):
                         guaranteed.append(headline)
@@ -342,11 +1066,11 @@ class ProfessionalNewsGenerator:
         }
         
         try:
-            response = requests.get(self.base_url, params=params, timeout=30)
-            self.call_count += 1
+            response = self._session.get(self.base_url, params=params, timeout=30)
+            self._count_call()
             
             if response.status_code == 200:
-                data = response.json()
+                data = _json_loads(response.content)
                 
                 if 'feed' in data:
                     raw_articles = data['feed']
@@ -356,10 +1080,11 @@ class ProfessionalNewsGenerator:
                     for article in raw_articles:
                         if self._is_quality_major_headline(article):
                             normalized = self._normalize_article(article)
+                            normalized['_score'] = self._get_priority_score(normalized)
                             major_headlines.append(normalized)
                     
                     # Sort by priority
-                    major_headlines.sort(key=lambda x: self._get_priority_score(x), reverse=True)
+                    major_headlines.sort(key=itemgetter('_score'), reverse=True)
                     
                     return major_headlines[:remaining_limit]
                     
@@ -421,12 +1146,7 @@ class ProfessionalNewsGenerator:
         has_quality_content = any(term in title or term in summary for term in quality_indicators)
         
         # Major company earnings are OK if from reputable sources
-        major_companies = [
-            'apple', 'microsoft', 'google', 'amazon', 'tesla', 'nvidia',
-            'meta', 'netflix', 'adobe', 'oracle', 'salesforce'
-        ]
-        
-        is_major_company_news = any(company in title for company in major_companies)
+        is_major_company_news = not _HEADLINE_MAJOR_COMPANIES.isdisjoint(_title_tokens(title))
         is_reputable_source = any(src in source for src in ['cnbc', 'reuters', 'bloomberg', 'wsj', 'marketwatch'])
         
         # Title quality checks
@@ -443,61 +1163,18 @@ class ProfessionalNewsGenerator:
         score = 0
         
         # HIGHEST PRIORITY: Quality Gold and Bitcoin market news (150+)
-        if self._is_quality_gold_commodity_news(article):
+        if article['_is_gold']:
             score += 150
-        elif self._is_quality_crypto_market_news(article):
+        elif article['_is_crypto']:
             score += 140
         
-        forex_critical = [
-            'federal reserve', 'fed meeting', 'fomc', 'interest rate', 'monetary policy',
-            'ecb', 'boe', 'boj', 'snb', 'rba', 'boc', # International Central Banks
-            'cpi', 'inflation data', 'non-farm payrolls', 'nfp', # Top-tier data
-            'jobs report', 'gdp', 'unemployment', 'hawkish', 'dovish'
-        ]
-        if any(term in title for term in forex_critical):
-            score += 160
-
-        # GEOPOLITICAL EVENTS (140+)
-        # A crucial new category for major market-moving news.
-        geopolitical_events = [
-            'geopolitical', 'trade war', 'tariffs', 'sanctions', 'election', 
-            'summit', 'opec', 'brexit'
-        ]
-        if any(term in title for term in geopolitical_events):
-            score += 140
-
-        # FOREX & BOND MARKET MOVEMENT (120+)
-        # Specific terms for currency and bond market volatility.
-        forex_market_events = [
-            'dollar', 'euro', 'yen', 'pound', 'currency', 'risk-on', 'risk-off', 
-            'safe-haven', 'bond yields', 'yield curve', 'treasury'
-        ]
-        if any(term in title for term in forex_market_events):
-            score += 120
-            
-        # MEDIUM-HIGH: General Stock Market Movements (80+)
-        # Your existing list, still relevant for overall sentiment.
-        market_events = [
-            'record high', 'all-time high', 'market rally', 'market surge',
-            'dow hits', 'nasdaq reaches', 's&p 500', 'correction', 'sell-off'
-        ]
-        if any(term in title for term in market_events):
-            score += 80
-        
-        # MEDIUM: Sector/Commodity News (60+)
-        # Your existing list, works well.
-        sector_news = [
-            'oil prices', 'crude oil', 'energy sector', 'tech sector',
-            'banking sector', 'financials'
-        ]
-        if any(term in title for term in sector_news):
-            score += 60
+        # Keyword categories (forex/central banks, geopolitics, FX & bonds, market moves, sectors)
+        categories_hit = _PRIORITY_MATCHER.categories(title)
+        score += sum(_PRIORITY_WEIGHTS[category] for category in categories_hit)
         
         # MEDIUM-LOW: Major Company Earnings (40+)
         # Your existing list for major tech earnings.
-        if 'earnings' in title and any(company in title for company in [
-            'apple', 'microsoft', 'google', 'amazon', 'tesla', 'nvidia'
-        ]):
+        if 'earnings' in title and not _EARNINGS_MAJOR_COMPANIES.isdisjoint(_title_tokens(title)):
             score += 40
         
         # BONUS: Strong sentiment indicates market impact
@@ -520,442 +1197,252 @@ class ProfessionalNewsGenerator:
         """Get headlines from a specific timeframe"""
         end_date = datetime.now() - timedelta(days=days_back_start)
         start_date = datetime.now() - timedelta(days=days_back_end)
-        
-        params = {
-            'function': 'NEWS_SENTIMENT',
-            'apikey': self.api_key,
-            'limit': limit,
-            'time_from': start_date.strftime('%Y%m%dT0000'),
-            'time_to': end_date.strftime('%Y%m%dT2359'),
-            'sort': 'LATEST'
-        }
-        
-        try:
-            response = requests.get(self.base_url, params=params, timeout=30)
-            self.call_count += 1
-            
-            if response.status_code == 200:
-                data = response.json()
-                if 'feed' in data:
-                    return [self._normalize_article(a) for a in data['feed']]
-        except Exception as e:
-            print(f"❌ Error getting timeframe headlines: {e}")
-        
-        return []
-    
-    def _is_quality_headline(self, article) -> bool:
-        """Basic quality check for headlines"""
-        title = article.get('title', '')
-        
-        # Basic quality checks
-        title_length_ok = 25 <= len(title) <= 150
-        not_all_caps = not title.isupper()
-        not_spam = not any(spam in title.lower() for spam in ['alert', 'reminder', 'deadline'])
-        
-        return title_length_ok and not_all_caps and not_spam
-    
-    def _remove_duplicate_headlines(self, headlines) -> List[Dict[str, Any]]:
-        """Remove duplicate headlines based on title similarity"""
-        seen_titles = set()
-        unique_headlines = []
-        
-        for headline in headlines:
-            title_key = headline.get('title', '').lower()[:60]  # First 60 chars as key
-            if title_key not in seen_titles:
-                seen_titles.add(title_key)
-                unique_headlines.append(headline)
-        
-        return unique_headlines
-
-    def display_headlines(self) -> None:
-        """Display major headlines in a clean format"""
-        headlines = self.get_major_headlines()
-        
-        if not headlines:
-            print("❌ No major headlines available")
-            return
-        
-        print("\n" + "="*80)
-        print("📰 MAJOR MARKET HEADLINES TODAY")
-        print("="*80)
-        
-        for i, headline in enumerate(headlines, 1):
-            # Format timestamp and check if it's from previous days
-            time_pub = headline.get('time_published', '')
-            age_indicator = ""
-            
-            if time_pub and len(time_pub) >= 8:
-                try:
-                    pub_date = datetime.strptime(time_pub[:8], '%Y%m%d')
-                    today = datetime.now().date()
-                    pub_date_only = pub_date.date()
-                    
-                    days_ago = (today - pub_date_only).days
-                    
-                    if days_ago == 0:
-                        formatted_time = f"{time_pub[4:6]}/{time_pub[6:8]} {time_pub[9:11]}:{time_pub[11:13]}"
-                    elif days_ago == 1:
-                        formatted_time = f"Yesterday {time_pub[9:11]}:{time_pub[11:13]}"
-                        age_indicator = " 📅"
-                    elif days_ago <= 7:
-                        formatted_time = f"{days_ago}d ago {time_pub[9:11]}:{time_pub[11:13]}"
-                        age_indicator = " 📅"
-                    else:
-                        formatted_time = f"{time_pub[4:6]}/{time_pub[6:8]} (older)"
-                        age_indicator = " 📅"
-                        
-                except:
-                    formatted_time = "Recent"
-            else:
-                formatted_time = "Recent"
-            
-            # Format tickers
-            tickers_display = ""
-            if headline.get('tickers'):
-                tickers_display = f" [{', '.join(headline['tickers'][:3])}]"
-            
-            # IMPROVED sentiment icon assignment
-            if self._is_quality_gold_commodity_news(headline):
-                sentiment_icon = "🥇"
-            elif self._is_quality_crypto_market_news(headline):
-                sentiment_icon = "₿"
-            elif headline.get('sentiment') == 'bullish':
-                sentiment_icon = "📈"
-            elif headline.get('sentiment') == 'bearish':
-                sentiment_icon = "📉"
-            else:
-                sentiment_icon = "📊"
-            
-            print(f"\n{i:2d}. {headline['title']}{tickers_display}{age_indicator}")
-            print(f"    {sentiment_icon} {headline.get('sentiment', 'neutral').title()} | {headline['source']} | {formatted_time}")
-            
-            if headline.get('summary') and len(headline['summary']) > 50:
-                summary_short = headline['summary'][:120] + "..." if len(headline['summary']) > 120 else headline['summary']
-                print(f"    {summary_short}")
-        
-        print(f"\n📊 Total headlines: {len(headlines)}")
-        print("🥇 Gold Commodity | ₿ Bitcoin/Crypto Market | 📅 Previous days")
-        print("="*80)
-
-    # ===== Content Generation with Style System =====
-    def _generate_content_with_style(self, news: List[Dict], day: str, theme: str, style_key: str) -> Tuple[str, str, str, str, str]:
-        """Generate professional content using specified style guide"""
-        
-        style_config = self.style_guide[style_key]
-        target_seconds = style_config["target_seconds"]
-        
-        if not news:
-            return self._create_fallback_content_with_style(news, day, style_key)
-
-        # Prepare context with top stories
-        top_stories = []
-        for i, article in enumerate(news[:5], 1):
-            tickers_str = f" (${', '.join(article['tickers'][:2])})" if article.get('tickers') else ""
-            top_stories.append(f"{i}. {article['title']}{tickers_str}")
-            top_stories.append(f"   Sentiment: {article['sentiment']} ({article['sentiment_score']:.2f})")
-            if article.get('summary'):
-                top_stories.append(f"   Summary: {article['summary'][:100]}...")
-        
-        context = f"Date: {datetime.now().strftime('%B %d, %Y')}\nTop Stories Available:\n" + "\n".join(top_stories)
-        
-        # Style-specific system prompt
-        system_prompt = f"""You are an expert global market analyst creating content for a sophisticated financial audience. Your primary goal is to identify and report on the most impactful news driving global markets.
-
-PRIORITIZATION HIERARCHY:
-1.  **Top Priority:** Major economic data releases (Inflation/CPI, GDP, Jobs/NFP) from G7 nations.
-2.  **High Priority:** Central bank announcements (Fed, ECB, BoE, BoJ) and significant geopolitical events.
-3.  **Medium Priority:** Major M&A deals and significant, confirmed corporate news.
-4.  **Lower Priority:** Market speculation, rumors, and analyst commentary.
-
-Your task is to select the top 3 most important stories from the provided context based on this hierarchy and build the script around them.
-
-
-SELECTED STYLE: {style_config['name']}
-DESCRIPTION: {style_config['description']}
-TONE: {style_config['tone']}
-PACING: {style_config['pacing']}
-TARGET LENGTH: {target_seconds} seconds
-
-VOICE-FRIENDLY RULES:
-- NEVER write ticker symbols that will be read aloud (e.g., $AAPL, FOREX:USD, CRYPTO:BTC)
-- Use company/asset names: "Apple", "US Dollar", "Bitcoin"
-- For unknown tickers, use generic terms: "the company", "related stocks", "cryptocurrency markets"
-- Only use ticker symbols in parentheses if they add clarity
-
-CRITICAL: Return ONLY valid JSON with script, social, motion, caption, and title keys."""
-
-        # Style-specific user prompt
-        user_prompt = self._build_style_specific_prompt(style_key, context, target_seconds, theme)
-        
-        try:
-            print(f"🤖 Generating {style_config['name']} content with GPT-4o...")
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_completion_tokens=1200,
-                temperature=0.3,
-                response_format={"type": "json_object"}
-            )
-            
-            full_output = response.choices[0].message.content.strip()
-            
-            try:
-                parsed = json.loads(full_output)
-            except json.JSONDecodeError as e:
-                print(f"❌ JSON parsing error: {e}")
-                return self._create_fallback_content_with_style(news, day, style_key)
-
-            script = parsed.get("script", "").strip()
-            social = parsed.get("social", "").strip()
-            motion = parsed.get("motion", "").strip()
-            caption = parsed.get("caption", "").strip()
-            title = parsed.get("title", "").strip()
-
-            if self._validate_professional_content(script, social, motion, caption, target_seconds):
-                print(f"✅ Success with {style_config['name']} style")
-                return script, social, motion, caption, title
-            else:
-                print(f"⚠️ Content quality check failed, using fallback")
-                return self._create_fallback_content_with_style(news, day, style_key)
-
-        except Exception as e:
-            print(f"❌ Error generating content: {str(e)}")
-            return self._create_fallback_content_with_style(news, day, style_key)
-
-    def _build_style_specific_prompt(self, style_key: str, context: str, target_seconds: int, theme: str, weekly_context: Dict = None) -> str:
-        """Build style-specific prompts for different news styles"""
-        
-        current_date = datetime.now().strftime('%B %d')
-        
-        # Base requirements for all styles
-        base_requirements = f"""
-    CONTEXT:
-    {context}
-
-    SCRIPT REQUIREMENTS:
-    - {target_seconds} seconds when spoken at news pace (~{target_seconds * 2.5} words)
-    - EXACTLY 3 STORIES with varied, natural transitions
-    - VOICE-FRIENDLY: Use company names, not ticker symbols
-    - EXCLUDE: Legal notices, shareholder alerts, class action lawsuits
-    - FOCUS: Market movements, earnings, economic policy, sector trends
-    - TARGET LENGTH: Aim for {target_seconds * 2.5} words minimum
-
-    SOCIAL POST REQUIREMENTS:
-    - 60-90 words, professional LinkedIn/X audience
-    - Strong opening, 2-3 bullet points, concluding thought
-    - Include 2-3 relevant tickers or figures
-    - NO emojis, 3-4 hashtags like #MarketUpdate #Investing
-
-    MOTION SCRIPT (300 chars max):
-    - Professional body language directions
-    - Opening stance, gestures, transitions, closing
-
-    VIDEO CAPTION (60-80 chars):
-    - Professional video title with date and key topics
-
-    THEME: {theme}
-
-    Return JSON format:
-    {{
-    "script": "script here",
-    "social": "social post here", 
-    "motion": "motion directions here",
-    "caption": "video caption here",
-    "title": "episode title here"
-    }}
-    """
-
-        # Style-specific examples and instructions
-        if style_key == "classic_daily":
-            return f"""Create a 'Classic Daily Brief' script that is punchy, insightful, and tells a story about the market today.
-
-    CRITICAL INSTRUCTIONS:
-    1.  **Find the Narrative:** Don't just list news. Find the connecting theme. Is today about inflation fears? A tech rebound? Geopolitical tension? State this theme upfront.
-    2.  **Answer "So What?":** For each story, immediately explain its impact. Why should a regular investor care? Use phrases that connect news to personal impact (e.g., "which could mean...", "the big risk here is...").
-    3.  **Use a Conversational Hook:** Start with a question or a bold statement, not just "Here's your update."
-
-    TEMPLATE / STRUCTURE:
-    "[Engaging Hook related to the day's theme]. Let's break down what's really moving the markets.
-    First up, the biggest story: [STORY 1, explaining its direct market impact].
-    Next, keep an eye on this: [STORY 2, explaining what it signals for the future].
-    And finally, a move under the radar: [STORY 3, and why it matters].
-    So, the big picture today is [reiterate the main theme]. That's your rundown — see you tomorrow!"
-
-    EXAMPLE STYLE (This is the tone to aim for):
-    "So, is the market finally getting nervous about inflation? Let's break down what's really moving the markets.
-    First up, the biggest story: The Fed just signaled that rate cuts might be further away than we thought, which sent a shockwave through the tech sector.
-    Next, keep an eye on this: Oil prices are spiking above $95 a barrel. For you, that could mean more pain at the gas pump very soon.
-    And finally, a move under the radar: A major corporate Bitcoin purchase just hit the wires, showing big institutions are still betting on crypto long-term.
-    So, the big picture today is caution. The market is weighing inflation risks against corporate confidence. That's your rundown — see you tomorrow!"
-
-    KEY PHRASES TO USE:
-    - "Let's break down what's really moving the markets."
-    - "The big picture today is..."
-    - "For you, that could mean..."
-    - "Keep an eye on this..."
-
-    {base_requirements}"""
-
-        elif style_key == "breaking_alert":
-            return f"""Create a Breaking News Alert script following this URGENT template:
-
-    TEMPLATE:
-    "BREAKING NEWS for your market update. First, [URGENT STORY with immediate impact]. 
-    JUST IN — [SECOND BREAKING STORY with dramatic element]. And finally — [THIRD STORY with critical level]. 
-    All eyes are on what happens next. That's your breaking update — more as it develops."
-
-    EXAMPLE STYLE:
-    "BREAKING NEWS for your market update. First, the Fed just signaled a surprise policy shift, sending tech stocks tumbling. 
-    JUST IN — NVIDIA shares are halted pending a major announcement, sparking sector-wide volatility. 
-    And finally — Bitcoin has just breached a critical support level at $115,000. 
-    All eyes are on what happens next. That's your breaking update — more as it develops."
-
-    KEY PHRASES TO USE:
-    - "BREAKING NEWS"
-    - "JUST IN"
-    - "sparking sector-wide volatility"
-    - "critical support/resistance level"
-    - "All eyes are on what happens next"
-
-    {base_requirements}"""
-
-        elif style_key == "weekly_deep":
-            # Enhanced weekly deep dive with actual weekly context
-            weekly_info = ""
-            if weekly_context:
-                themes = weekly_context.get('themes', {})
-                summary = weekly_context.get('summary', {})
-                
-                if themes.get('primary_theme'):
-                    weekly_info += f"WEEKLY THEME: {themes['primary_theme']}\n"
-                
-                if summary.get('weekly_change'):
-                    weekly_info += f"WEEKLY PERFORMANCE: S&P 500 {summary['weekly_change']}\n"
-                
-                if themes.get('sector_leaders'):
-                    leaders = [sector.title() for sector, count in themes['sector_leaders'][:2]]
-                    weekly_info += f"LEADING SECTORS: {', '.join(leaders)}\n"
-                
-                if themes.get('top_5_stories'):
-                    weekly_info += "TOP 5 WEEKLY STORIES PROVIDED IN CONTEXT\n"
-            
-            return f"""Create a TRUE Weekly Deep Dive script following this ANALYTICAL template:
-
-    IMPORTANT: This is a WEEKLY ANALYSIS covering Monday through Friday, NOT daily news.
-
-    TEMPLATE:
-    "Here is your weekly market analysis. The primary catalyst this week was [WEEKLY THEME from context], which [WEEKLY MARKET IMPACT and performance]. 
-    In corporate developments, [MAJOR CORPORATE STORY from the week with broader implications]. 
-    Looking ahead, the key data point will be [UPCOMING WEEK'S FOCUS]. The street is anticipating [NEXT WEEK'S EXPECTATION]. 
-    This has been your weekly market analysis."
-
-    WEEKLY CONTEXT PROVIDED:
-    {weekly_info}
-
-    WEEKLY LANGUAGE REQUIREMENTS:
-    - Use "this week" not "today" 
-    - Reference week-long trends: "throughout the week", "over five trading days"
-    - Mention weekly performance: "the S&P gained X% for the week"
-    - Use past tense for the week's events: "dominated this week", "emerged as"
-    - Forward-looking: "heading into next week", "the week ahead"
-
-    EXAMPLE WEEKLY STYLE:
-    "Here is your weekly market analysis. The primary catalyst this week was Federal Reserve uncertainty, which created sustained volatility across all major indices with the S&P 500 gaining 1.8% for the week despite Tuesday's selloff.
-    In corporate developments, the energy sector dominated headlines with three major oil companies reporting record quarterly profits, underscoring the sector's resilience amid geopolitical tensions. 
-    Looking ahead, the key data point will be next week's inflation data release. The street is anticipating this could determine the Fed's December policy stance.
-    This has been your weekly market analysis."
-
-    KEY WEEKLY PHRASES TO USE:
-    - "The primary catalyst this week was..."
-    - "throughout the trading week"
-    - "dominated headlines this week"
-    - "over the five-day period"
-    - "heading into next week"
-    - "This has been your weekly market analysis"
-
-    {base_requirements}"""
-
-        elif style_key == "market_pulse":
-            return f"""Create a Market Pulse script following this ENERGETIC template:
-
-    TEMPLATE:
-    "Time for your market pulse check! [SECTOR/ASSET] is [ACTION VERB] today on [CATALYST]. 
-    Meanwhile, [CONTRASTING STORY] as traders [REACTION]. The mood on the street? [SENTIMENT]. 
-    Here's what's driving the action: [KEY FACTORS]. Your market pulse — [CURRENT STATE] with [OUTLOOK]. Keep watching!"
-
-    KEY ACTION VERBS TO USE:
-    - surging, plunging, rallying, retreating, soaring, tumbling, spiking, diving
-
-    KEY PHRASES TO USE:
-    - "Time for your market pulse check!"
-    - "Meanwhile"
-    - "The mood on the street?"
-    - "Here's what's driving the action:"
-    - "Your market pulse —"
-    - "Keep watching!"
-
-    TONE: Energetic, rhythmic, engaging with momentum-focused language
+        
+        params = {
+            'function': 'NEWS_SENTIMENT',
+            'apikey': self.api_key,
+            'limit': limit,
+            'time_from': start_date.strftime('%Y%m%dT0000'),
+            'time_to': end_date.strftime('%Y%m%dT2359'),
+            'sort': 'LATEST'
+        }
+        
+        try:
+            response = self._session.get(self.base_url, params=params, timeout=30)
+            self._count_call()
+            
+            if response.status_code == 200:
+                data = _json_loads(response.content)
+                if 'feed' in data:
+                    return [self._normalize_article(a) for a in data['feed']]
+        except Exception as e:
+            print(f"❌ Error getting timeframe headlines: {e}")
+        
+        return []
+    
+    def _is_quality_headline(self, article) -> bool:
+        """Basic quality check for headlines"""
+        title = article.get('title', '')
+        
+        # Basic quality checks
+        title_length_ok = 25 <= len(title) <= 150
+        not_all_caps = not title.isupper()
+        not_spam = not any(spam in title.lower() for spam in ['alert', 'reminder', 'deadline'])
+        
+        return title_length_ok and not_all_caps and not_spam
+    
+    def _remove_duplicate_headlines(self, headlines) -> List[Dict[str, Any]]:
+        """Remove duplicate headlines based on title similarity"""
+        seen_titles = set()
+        unique_headlines = []
+        
+        for headline in headlines:
+            title_key = headline.get('title', '').lower()[:60]  # First 60 chars as key
+            if title_key not in seen_titles:
+                seen_titles.add(title_key)
+                unique_headlines.append(headline)
+        
+        return unique_headlines
 
-    {base_requirements}"""
+    def display_headlines(self) -> None:
+        """Display major headlines in a clean format"""
+        headlines = self.get_major_headlines()
+        
+        if not headlines:
+            print("❌ No major headlines available")
+            return
+        
+        # Collect the listing and write it in one go; per-line prints each encode and flush on Windows consoles
+        lines = ["\n" + "="*80, "📰 MAJOR MARKET HEADLINES TODAY", "="*80]
+        
+        for i, headline in enumerate(headlines, 1):
+            # Format timestamp and check if it's from previous days
+            time_pub = headline.get('time_published', '')
+            days_ago = headline.get('_age_days')
+            age_indicator = ""
+            
+            if days_ago is None:
+                formatted_time = "Recent"
+            elif days_ago == 0:
+                formatted_time = f"{time_pub[4:6]}/{time_pub[6:8]} {time_pub[9:11]}:{time_pub[11:13]}"
+            elif days_ago == 1:
+                formatted_time = f"Yesterday {time_pub[9:11]}:{time_pub[11:13]}"
+                age_indicator = " 📅"
+            elif days_ago <= 7:
+                formatted_time = f"{days_ago}d ago {time_pub[9:11]}:{time_pub[11:13]}"
+                age_indicator = " 📅"
+            else:
+                formatted_time = f"{time_pub[4:6]}/{time_pub[6:8]} (older)"
+                age_indicator = " 📅"
+            
+            # Format tickers
+            tickers_display = ""
+            if headline.get('tickers'):
+                tickers_display = f" [{', '.join(headline['tickers'][:3])}]"
+            
+            # IMPROVED sentiment icon assignment
+            if headline['_is_gold']:
+                sentiment_icon = "🥇"
+            elif headline['_is_crypto']:
+                sentiment_icon = "₿"
+            elif headline.get('sentiment') == 'bullish':
+                sentiment_icon = "📈"
+            elif headline.get('sentiment') == 'bearish':
+                sentiment_icon = "📉"
+            else:
+                sentiment_icon = "📊"
+            
+            lines.append(f"\n{i:2d}. {headline['title']}{tickers_display}{age_indicator}")
+            lines.append(f"    {sentiment_icon} {headline.get('sentiment', 'neutral').title()} | {headline['source']} | {formatted_time}")
+            
+            if headline.get('summary') and len(headline['summary']) > 50:
+                summary_short = headline['summary'][:120] + "..." if len(headline['summary']) > 120 else headline['summary']
+                lines.append(f"    {summary_short}")
+        
+        lines.append(f"\n📊 Total headlines: {len(headlines)}")
+        lines.append("🥇 Gold Commodity | ₿ Bitcoin/Crypto Market | 📅 Previous days")
+        lines.append("="*80)
+        print("\n".join(lines))
 
-        elif style_key == "forex_briefing":
-            return f"""Create a Forex Daily Briefing script focusing on actual currency market impact:
+    # ===== Content Generation with Style System =====
+    def _generate_content_with_style(self, news: List[Dict], day: str, theme: str, style_key: str) -> Tuple[str, str, str, str, str]:
+        """Generate professional content using specified style guide"""
+        
+        if not news:
+            return self._create_fallback_content_with_style(news, day, style_key)
 
-        CRITICAL INSTRUCTIONS:
-        - Analyze the provided news context for stories that affect major currencies
-        - Focus ONLY on G7 currencies: USD, EUR, JPY, GBP, CAD, AUD, CHF
-        - If economic data is mentioned, explain its currency impact
-        - If no forex-relevant news exists, create a brief summary acknowledging limited forex developments
-        - Use specific currency pair names (EUR/USD, GBP/JPY, etc.) only when justified by the news
-        - Do NOT use placeholder examples or generic statements
+        request = self._build_completion_request(news, theme, style_key)
+        
+        try:
+            print(f"🤖 Generating {self.style_guide[style_key]['name']} content with GPT-4o...")
+            
+            stream = self.openai_client.chat.completions.create(**request)
+            full_output = ""
+            for chunk in stream:
+                full_output += _stream_delta(chunk)
+                if not _could_be_json_object(full_output):
+                    stream.close()
+                    break
+            return self._parse_generated_content(full_output.strip(), news, day, style_key)
 
-        TEMPLATE STRUCTURE (adapt based on actual news):
-        "Here is your forex daily briefing for {current_date}. [Analyze actual news for currency impacts]
-        [Connect specific news to currency movements]
-        [Mention any relevant central bank developments]
-        Looking ahead, [mention actual upcoming events if any]. That's your forex briefing — trade safe."
+        except Exception as e:
+            print(f"❌ Error generating content: {str(e)}")
+            return self._create_fallback_content_with_style(news, day, style_key)
 
-        AVOID:
-        - Generic examples like "testing 1.10 resistance"
-        - Placeholder currency pairs when news doesn't support them
-        - Making up economic data releases not mentioned in context
+    def _build_completion_request(self, news: List[Dict], theme: str, style_key: str) -> Dict[str, Any]:
+        """Build the chat completion arguments for one style"""
+        target_seconds = self.style_guide[style_key]["target_seconds"]
 
-        {base_requirements}"""
+        # Prepare context with top stories
+        top_stories = []
+        for i, article in enumerate(news[:5], 1):
+            tickers_str = f" (${', '.join(article['tickers'][:2])})" if article.get('tickers') else ""
+            top_stories.append(f"{i}. {article['title']}{tickers_str} | {article['sentiment']} ({article['sentiment_score']:.2f})")
+            if article.get('summary'):
+                top_stories.append(f"   Summary: {article['summary'][:100]}...")
+        
+        context = f"Date: {self._context_date}\nTop Stories Available:\n" + "\n".join(top_stories)
+        
+        # Style-specific user prompt
+        user_prompt = self._build_style_specific_prompt(style_key, context, target_seconds, theme)
+        
+        return {
+            "model": "gpt-4o",
+            "messages": [
+                # Static prefix first so the provider's prefix cache matches across styles
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {"role": "system", "content": self._style_briefs[style_key]},
+                {"role": "user", "content": user_prompt}
+            ],
+            "max_completion_tokens": _MAX_COMPLETION_TOKENS,
+            "temperature": 0.3,
+            "response_format": {"type": "json_schema", "json_schema": _SCRIPT_SCHEMA},
+            "stream": True
+        }
 
-        elif style_key == "strategic_outlook":
-            return f"""Create a Strategic Outlook script following this INSTITUTIONAL template:
+    def _parse_generated_content(self, full_output: str, news: List[Dict], day: str, style_key: str) -> Tuple[str, str, str, str, str]:
+        """Parse and validate the model's JSON reply, falling back on bad output"""
+        style_config = self.style_guide[style_key]
+        
+        try:
+            parsed = _json_loads(full_output)
+        except json.JSONDecodeError as e:
+            print(f"❌ JSON parsing error: {e}")
+            return self._create_fallback_content_with_style(news, day, style_key)
 
-    TEMPLATE:
-    "Your strategic market briefing: [MACRO CONTEXT] is reshaping [MARKET/SECTOR] dynamics. 
-    From a strategic standpoint, [INSTITUTIONAL PERSPECTIVE with risk/reward analysis]. 
-    On the tactical side, watch for [SPECIFIC LEVELS/EVENTS] as potential inflection points. 
-    Our take: [STRATEGIC RECOMMENDATION] while monitoring [KEY RISKS]. Strategic briefing complete — position accordingly."
+        content = {field: parsed.get(field, "").strip() for field in _CONTENT_FIELDS}
+        fallback = None
 
-    KEY INSTITUTIONAL PHRASES TO USE:
-    - "Your strategic market briefing:"
-    - "From a strategic standpoint..."
-    - "The risk-reward equation suggests..."
-    - "On the tactical side..."
-    - "Our take:"
-    - "as potential inflection points"
-    - "Strategic briefing complete — position accordingly"
+        ok, failed_field = self._validate_professional_content(
+            content["script"], content["social"], content["motion"], content["caption"], style_config["target_seconds"])
+        while not ok:
+            if fallback is None:
+                fallback = dict(zip(_CONTENT_FIELDS, self._create_fallback_content_with_style(news, day, style_key)))
+            if content[failed_field] == fallback[failed_field]:
+                # Even the fallback text fails this check, so give up on the reply entirely
+                print(f"⚠️ Content quality check failed, using fallback")
+                return tuple(fallback.values())
+            
+            # Keep the good fields and swap in fallback text for the one that failed
+            print(f"⚠️ {failed_field.title()} failed quality check, using fallback {failed_field}")
+            content[failed_field] = fallback[failed_field]
+            ok, failed_field = self._validate_professional_content(
+                content["script"], content["social"], content["motion"], content["caption"], style_config["target_seconds"])
 
-    TONE: Advisory, measured, institutional with strategic perspective
+        print(f"✅ Success with {style_config['name']} style")
+        return tuple(content.values())
 
-    {base_requirements}"""
+    def _build_style_specific_prompt(self, style_key: str, context: str, target_seconds: int, theme: str, weekly_context: Dict = None) -> str:
+        """Build style-specific prompts for different news styles"""
         
-        else:
-            # Handle unknown style keys gracefully
-            return base_requirements
+        # Enhanced weekly deep dive with actual weekly context
+        weekly_info = ""
+        if style_key == "weekly_deep" and weekly_context:
+            themes = weekly_context.get('themes', {})
+            summary = weekly_context.get('summary', {})
+            
+            if themes.get('primary_theme'):
+                weekly_info += f"WEEKLY THEME: {themes['primary_theme']}\n"
+            
+            if summary.get('weekly_change'):
+                weekly_info += f"WEEKLY PERFORMANCE: S&P 500 {summary['weekly_change']}\n"
+            
+            if themes.get('sector_leaders'):
+                leaders = [sector.title() for sector, count in themes['sector_leaders'][:2]]
+                weekly_info += f"LEADING SECTORS: {', '.join(leaders)}\n"
+            
+            if themes.get('top_5_stories'):
+                weekly_info += "TOP 5 WEEKLY STORIES PROVIDED IN CONTEXT\n"
+        
+        # Retries and repeat runs rebuild the same prompt; the context is hashed to keep keys small
+        cache_key = (style_key, target_seconds, theme, self._run_date, weekly_info,
+                     hashlib.blake2b(context.encode(), digest_size=16).digest())
+        prompt = self._prompt_cache.get(cache_key)
+        if prompt is not None:
+            return prompt
+        
+        # Base requirements for all styles
+        base_requirements = _BASE_REQUIREMENTS_TEMPLATE.format_map({
+            'context': context,
+            'target_seconds': target_seconds,
+            'target_words': target_seconds * 2.5,
+            'theme': theme
+        })
+        fields = {'base_requirements': base_requirements, 'current_date': self._run_date, 'weekly_info': weekly_info}
+
+        # Style-specific examples and instructions; unknown style keys get the base requirements only
+        template = _STYLE_PROMPTS.get(style_key)
+        prompt = template.format_map(fields) if template is not None else base_requirements
+        
+        if len(self._prompt_cache) >= _PROMPT_CACHE_SIZE:
+            self._prompt_cache.clear()
+        self._prompt_cache[cache_key] = prompt
+        return prompt
 
     def _create_fallback_content_with_style(self, news: List[Dict], day: str, style_key: str) -> Tuple[str, str, str, str, str]:
         """Create style-specific fallback content"""
         style_config = self.style_guide[style_key]
-        current_date = datetime.now().strftime('%B %d')
+        current_date = self._run_date
         
         # Style-specific fallback scripts
         if style_key == "breaking_alert":
@@ -983,26 +1470,23 @@ CRITICAL: Return ONLY valid JSON with script, social, motion, caption, and title
         
         return script, social, motion, caption, title
 
-    def _validate_professional_content(self, script: str, social: str, motion: str, caption: str, target_seconds: int) -> bool:
-        """Validate generated content meets professional standards"""
+    def _validate_professional_content(self, script: str, social: str, motion: str, caption: str, target_seconds: int) -> Tuple[bool, Optional[str]]:
+        """Validate generated content meets professional standards.
+
+        Returns (ok, failed_field) so the caller can replace just the field that failed.
+        """
+        lengths = {'caption': len(caption), 'motion': len(motion), 'social': len(social)}
+        for field, (low, high) in _CONTENT_BOUNDS.items():
+            if not low <= lengths[field] <= high:
+                print(f"Validation failed: {field.title()} length is {lengths[field]}, outside {low}-{high} range.")
+                return False, field
         
-        if len(script) < 100:
+        # Longer styles need a longer script before it counts as a real one
+        if len(script) < max(100, int(target_seconds * 1.5)):
             print("Validation failed: Script too short.")
-            return False
-        
-        if len(social) > 800 or len(social) < 150:
-            print(f"Validation failed: Social post length is {len(social)}, outside 150-800 range.")
-            return False
-        
-        if len(motion) > 350 or len(motion) < 50:
-            print("Validation failed: Motion script length out of range.")
-            return False
+            return False, 'script'
         
-        if len(caption) > 100 or len(caption) < 20:
-            print("Validation failed: Caption length out of range.")
-            return False
-        
-        return True
+        return True, None
 
     # ===== News Fetch =====
     def _get_high_quality_news(self, limit=8):
@@ -1014,13 +1498,16 @@ CRITICAL: Return ONLY valid JSON with script, social, motion, caption, and title
         }
         try:
             print(f"🔍 Calling Alpha Vantage API...")
-            response = requests.get(self.base_url, params=params, timeout=30)
-            self.call_count += 1
+            if ijson is not None:
+                return self._stream_quality_news(params, limit)
+            
+            response = self._session.get(self.base_url, params=params, timeout=30)
+            self._count_call()
             
             print(f"📡 API Response Status: {response.status_code}")
             
             if response.status_code == 200:
-                data = response.json()
+                data = _json_loads(response.content)
                 print(f"📊 API Response Keys: {list(data.keys())}")
                 
                 if 'feed' in data:
@@ -1034,8 +1521,7 @@ CRITICAL: Return ONLY valid JSON with script, social, motion, caption, and title
                         print(f"Summary: {raw_articles[0].get('summary', 'N/A')[:100]}...")
                     
                     # IMPROVED filtering - use quality check instead of basic
-                    filtered_articles = [self._normalize_article(a) for a in raw_articles 
-                                       if self._is_quality_financial_content(a)]
+                    filtered_articles = [self._normalize_article(a) for a in self._filter_quality_articles(raw_articles)]
                     
                     if self.debug_mode:
                         print(f"📋 Articles after quality filtering: {len(filtered_articles)}")
@@ -1060,6 +1546,39 @@ CRITICAL: Return ONLY valid JSON with script, social, motion, caption, and title
             print(f"❌ Error getting news: {e}")
         return []
 
+    def _stream_quality_news(self, params: Dict[str, Any], limit: int) -> List[Dict]:
+        """Fetch a news feed with ijson, stopping once `limit` quality articles are found"""
+        with self._session.get(self.base_url, params=params, timeout=30, stream=True) as response:
+            self._count_call()
+            if response.status_code != 200:
+                print(f"❌ API error: {response.status_code}")
+                print(f"Response text: {response.text[:200]}...")
+                return []
+            
+            response.raw.decode_content = True
+            notices = {}
+            quality_articles = []
+            scanned = 0
+            # Checked one article at a time so the read can stop as soon as there are enough
+            for article in _iter_feed_items(response.raw, notices):
+                scanned += 1
+                if self._is_quality_article(article):
+                    quality_articles.append(article)
+                    if len(quality_articles) >= limit:
+                        break
+        
+        if not scanned:
+            print(f"❌ No 'feed' items in response")
+            if 'Error Message' in notices:
+                print(f"❌ API Error: {notices['Error Message']}")
+            for key in ('Note', 'Information'):
+                if key in notices:
+                    print(f"ℹ️ API {key}: {notices[key]}")
+        elif self.debug_mode:
+            print(f"📋 Articles after quality filtering: {len(quality_articles)} of {scanned} read")
+        
+        return [self._normalize_article(a) for a in quality_articles[:limit]]
+
     def _get_high_quality_news_timeframe(self, days_back, limit):
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days_back)
@@ -1071,105 +1590,104 @@ CRITICAL: Return ONLY valid JSON with script, social, motion, caption, and title
             'time_to': end_date.strftime('%Y%m%dT2359')
         }
         try:
-            response = requests.get(self.base_url, params=params, timeout=30)
-            self.call_count += 1
+            if ijson is not None:
+                return self._stream_quality_news(params, limit)
+            
+            response = self._session.get(self.base_url, params=params, timeout=30)
+            self._count_call()
             if response.status_code == 200:
-                data = response.json()
+                data = _json_loads(response.content)
                 if 'feed' in data:
                     raw_articles = data['feed']
-                    filtered_articles = [self._normalize_article(a) for a in raw_articles 
-                                       if self._is_quality_financial_content(a)]
+                    filtered_articles = [self._normalize_article(a) for a in self._filter_quality_articles(raw_articles)]
                     return filtered_articles[:limit]
         except Exception as e:
             print(f"❌ Error getting timeframe news: {e}")
         return []
     
-    def _is_quality_financial_content(self, article):
-        """IMPROVED: Enhanced check for quality financial content with stricter filtering"""
-        title = article.get('title', '').lower()
-        summary = article.get('summary', '').lower()
-        source = article.get('source', '').lower()
-        
-        # STRICT EXCLUSIONS - same as headline filtering
-        strict_exclusions = [
-            # Legal/spam content
-            'shareholder alert', 'class action', 'lawsuit', 'attorney', 'investigation',
-            'legal notice', 'court', 'settlement', 'plaintiff', 'damages', 'reminds investors',
-            'law firm', 'securities fraud', 'kahn swick', 'losses in excess',
-            
-            # Corporate filing spam
-            'announces grant', 'stock options', 'reverse stock split', 'stock split',
-            'dividend announcement', 'board of directors', 'executive appointment',
-            
-            # Retrospective/analysis spam
-            'if you invested', 'you would have', 'outperformed', '5 years ago',
-            'strong buy', 'trending stocks', 'stocks for your', 'zacks rank',
-            
-            # Generic content
-            '3 stocks', '5 stocks', 'top stocks', 'stocks to buy', 'stocks to watch'
-        ]
-        
-        if any(term in title for term in strict_exclusions):
-            return False
-        
-        # A story is significant if it's about a major company OR a high-impact event.
-        #is_significant = False
-        if any(company in title for company in self.MAJOR_COMPANIES):
-            is_significant = True
-        if any(keyword in title or keyword in summary for keyword in self.HIGH_IMPACT_KEYWORDS):
-            is_significant = True
+    def _filter_quality_articles(self, raw_articles: List[Dict]) -> List[Dict]:
+        """IMPROVED: Enhanced check for quality financial content with stricter filtering.
 
-        # If a story is not about a major name or a major event, we skip it.
-        #if not is_significant:
-            #return False
+        Runs each keyword regex once over the whole feed's title/summary columns
+        rather than article by article.
+        """
+        if not raw_articles:
+            return []
         
-        # POSITIVE INDICATORS for quality financial content
-        quality_indicators = [
-            # Market movements and data
-            'earnings', 'revenue', 'profit', 'guidance', 'outlook', 'beats', 'misses',
-            'market', 'trading', 'price', 'rally', 'surge', 'falls', 'drops',
-            
-            # Economic indicators
-            'fed', 'federal reserve', 'interest rate', 'inflation', 'gdp', 'employment',
-            'economic data', 'consumer confidence', 'retail sales', 'manufacturing',
-            
-            # Sectors and commodities
-            'energy', 'technology', 'healthcare', 'financials', 'oil prices', 'gold',
-            'cryptocurrency', 'bitcoin', 'ethereum', 'bonds', 'treasury', 'currency',
-            
-            # Major market events
-            'ipo', 'merger', 'acquisition', 'partnership', 'deal', 'contract'
-        ]
+        df = pd.DataFrame(raw_articles)
+        title = df['title'].fillna('').str.lower() if 'title' in df else pd.Series('', index=df.index)
+        summary = df['summary'].fillna('').str.lower() if 'summary' in df else pd.Series('', index=df.index)
+        
+        # STRICT EXCLUSIONS - same as headline filtering
+        excluded = title.str.contains(_FINANCIAL_EXCLUSION_RE)
         
         # Must have financial indicators AND quality checks
-        has_financial_content = any(term in title or term in summary for term in quality_indicators)
-        has_tickers = len(article.get('ticker_sentiment', [])) > 0
+        has_financial_content = title.str.contains(_FINANCIAL_QUALITY_RE) | summary.str.contains(_FINANCIAL_QUALITY_RE)
+        if 'ticker_sentiment' in df:
+            has_tickers = df['ticker_sentiment'].str.len().fillna(0) > 0
+        else:
+            has_tickers = pd.Series(False, index=df.index)
         
         # Title quality
-        title_length_ok = 25 <= len(title) <= 150
-        not_all_caps = not title.isupper()
+        title_length_ok = title.str.len().between(25, 150)
+        not_all_caps = ~title.str.isupper()
         
-        return (has_financial_content or has_tickers) and title_length_ok and not_all_caps
+        keep = ~excluded & (has_financial_content | has_tickers) & title_length_ok & not_all_caps
+        return [article for article, kept in zip(raw_articles, keep.tolist()) if kept]
+
+    def _is_quality_article(self, article) -> bool:
+        """Single-article form of _filter_quality_articles, for the streaming path"""
+        title = (article.get('title') or '').lower()
+        summary = (article.get('summary') or '').lower()
+        if _FINANCIAL_EXCLUSION_RE.search(title):
+            return False
+        has_financial_content = bool(_FINANCIAL_QUALITY_RE.search(title) or _FINANCIAL_QUALITY_RE.search(summary))
+        has_tickers = bool(article.get('ticker_sentiment'))
+        return (has_financial_content or has_tickers) and 25 <= len(title) <= 150 and not title.isupper()
 
     def _normalize_article(self, article):
-        tickers = [item.get('ticker') for item in article.get('ticker_sentiment', []) if item.get('ticker')]
+        g = article.get
+        tickers = [ticker for item in g('ticker_sentiment', ()) if (ticker := item.get('ticker'))]
         
-        return {
-            'title': article.get('title', ''),
-            'summary': article.get('summary', ''),
-            'source': article.get('source', ''),
-            'time_published': article.get('time_published', ''),
-            'sentiment': article.get('overall_sentiment_label', 'neutral'),
-            'sentiment_score': float(article.get('overall_sentiment_score', 0)),
+        # Age in days from the fixed YYYYMMDDTHHMM timestamp, sliced rather than run through strptime
+        time_published = g('time_published', '')
+        age_days = None
+        if len(time_published) >= 13:
+            try:
+                age_days = date.today().toordinal() - date(int(time_published[0:4]), int(time_published[4:6]),
+                                                           int(time_published[6:8])).toordinal()
+            except ValueError:
+                pass
+        
+        # Scores normally arrive as JSON floats; only convert other types
+        sentiment_score = g('overall_sentiment_score', 0)
+        if not isinstance(sentiment_score, float):
+            sentiment_score = float(sentiment_score)
+        
+        normalized = {
+            'title': g('title', ''),
+            'summary': g('summary', ''),
+            'source': g('source', ''),
+            'time_published': time_published,
+            'sentiment': g('overall_sentiment_label', 'neutral'),
+            'sentiment_score': sentiment_score,
             'tickers': tickers,
-            'url': article.get('url', ''),
-            'quality_score': 75
+            'url': g('url', ''),
+            '_age_days': age_days
         }
+        
+        # Category flags reused by scoring, guaranteed-headline selection and display
+        normalized['_is_gold'] = self._is_quality_gold_commodity_news(normalized)
+        normalized['_is_crypto'] = self._is_quality_crypto_market_news(normalized)
+        return normalized
 
     # ===== Market Data =====
+    @_market_cache(ttl_seconds=300)
     def _get_market_snapshot(self):
+        if yf is None:
+            print("⚠️ yfinance not installed. Install with: pip install yfinance")
+            return {'status': 'error'}
         try:
-            import yfinance as yf
             spy = yf.Ticker('SPY')
             hist = spy.history(period="2d")
             if len(hist) >= 2:
@@ -1181,22 +1699,25 @@ CRITICAL: Return ONLY valid JSON with script, social, motion, caption, and title
                     'change': f"{change_pct:+.2f}%", 
                     'status': 'connected'
                 }
-        except ImportError:
-            print("⚠️ yfinance not installed. Install with: pip install yfinance")
         except Exception as e:
             print(f"❌ Error getting market snapshot: {e}")
         return {'status': 'error'}
 
+    @_market_cache(ttl_seconds=300)
     def _get_recent_movers(self):
+        if yf is None:
+            return []
         try:
-            import yfinance as yf
             symbols = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA', 'NVDA']
+            tracked = symbols[:4]
+            
+            # One batched download instead of a history() request per symbol
+            hist = yf.download(tracked, period="2d", group_by="ticker", threads=True, progress=False)
             movers = []
-            for symbol in symbols[:4]:
-                ticker = yf.Ticker(symbol)
-                hist = ticker.history(period="2d")
-                if len(hist) >= 2:
-                    current, previous = hist['Close'].iloc[-1], hist['Close'].iloc[-2]
+            for symbol in tracked:
+                closes = hist[symbol]['Close'].dropna()
+                if len(closes) >= 2:
+                    current, previous = closes.iloc[-1], closes.iloc[-2]
                     change_pct = ((current - previous) / previous) * 100
                     if abs(change_pct) > 1.5:
                         movers.append({
@@ -1209,9 +1730,11 @@ CRITICAL: Return ONLY valid JSON with script, social, motion, caption, and title
             print(f"❌ Error getting movers: {e}")
             return []
 
+    @_market_cache(ttl_seconds=3600)
     def _get_weekly_summary(self):
+        if yf is None:
+            return {}
         try:
-            import yfinance as yf
             spy = yf.Ticker('SPY')
             hist = spy.history(period="1mo")
             if len(hist) >= 5:
@@ -1229,39 +1752,32 @@ CRITICAL: Return ONLY valid JSON with script, social, motion, caption, and title
         return {}
 
     # ===== Excel Saving =====
-    def save_to_excel(self, content: Dict[str, Any]) -> str:
-        """Save content to Excel with style information"""
-        filename = "market_content_tracker.xlsx"
+    def save_to_excel(self, content: Dict[str, Any], export_excel: bool = True) -> str:
+        """Log content with style information and, if requested, rebuild the Excel tracker.
+
+        Returns the workbook path, or the log path when export_excel is False.
+        """
+        filename = self.excel_path
         
         try:
-            file_exists = os.path.exists(filename)
-            
-            if file_exists:
-                try:
-                    existing_df = pd.read_excel(filename, sheet_name='Content_Log')
-                    print(f"📄 Updating existing file: {filename}")
-                    print(f"📊 Current entries in file: {len(existing_df)}")
-                except Exception as e:
-                    print(f"⚠️ Could not read existing file ({e}), creating new structure")
-                    existing_df = pd.DataFrame(columns=[
-                        'Date', 'Time', 'Day', 'Content_Type', 'Style', 'Script', 'Social_Post',
-                        'Motion_Script', 'Video_Caption', 'Episode_Title', 'Script_Length', 'Word_Count', 
-                        'News_Count', 'Market_Data', 'Quality_Score'
-                    ])
-            else:
-                existing_df = pd.DataFrame(columns=[
-                    'Date', 'Time', 'Day', 'Content_Type', 'Style', 'Script', 'Social_Post',
-                    'Motion_Script', 'Video_Caption', 'Episode_Title', 'Script_Length', 'Word_Count', 
-                    'News_Count', 'Market_Data', 'Quality_Score'
-                ])
-                print(f"📄 Creating new file: {filename}")
+            # Reload only when the log changed on disk since this generator last touched it
+            # (e.g. another session or the CLI appended to it)
+            if self._cols is None or self._log_signature() != self._log_seen:
+                # Seed the log once from a tracker written before the JSONL log existed
+                if not os.path.exists(self.log_path) and os.path.exists(filename):
+                    self._import_excel_log(filename)
+                self._cols = self._read_content_log() if os.path.exists(self.log_path) else _empty_log_columns()
+                self._stats = {'count': 0, 'sum_len': 0, 'sum_words': 0, 'style_counts': Counter()}
+                for style, length, words in zip(self._cols['Style'], self._cols['Script_Length'], self._cols['Word_Count']):
+                    self._count_log_entry(style, length, words)
             
             # Prepare new row data
             current_time = datetime.now()
+            script_len, word_count = self.script_stats(content)
             
-            market_data_str = ""
-            if content.get('market_data') and content['market_data'].get('status') == 'connected':
-                market_data_str = f"SPY: {content['market_data']['price']} ({content['market_data']['change']})"
+            market_data_str = content.get('_market_data_str')
+            if market_data_str is None:
+                market_data_str = _format_market_data(content.get('market_data'))
             
             new_row = {
                 'Date': current_time.strftime('%Y-%m-%d'),
@@ -1274,83 +1790,182 @@ CRITICAL: Return ONLY valid JSON with script, social, motion, caption, and title
                 'Motion_Script': content.get('motion_script', ''),
                 'Video_Caption': content.get('video_caption', ''),
                 'Episode_Title': content.get('episode_title', ''),
-                'Script_Length': len(content['script']),
-                'Word_Count': len(content['script'].split()),
+                'Script_Length': script_len,
+                'Word_Count': word_count,
                 'News_Count': content.get('news_count', 0),
                 'Market_Data': market_data_str,
                 'Quality_Score': 'Generated' if content.get('news_count', 0) > 0 else 'Fallback'
             }
             
-            new_row_df = pd.DataFrame([new_row])
-            new_df = pd.concat([existing_df, new_row_df], ignore_index=True)
+            if self.debug_mode:
+                print(f"🔍 Adding new row: {new_row['Date']} {new_row['Time']} - {new_row['Day']} ({new_row['Style']})")
             
-            print(f"🔍 Adding new row: {new_row['Date']} {new_row['Time']} - {new_row['Day']} ({new_row['Style']})")
+            for name, value in new_row.items():
+                self._cols[name].append(value)
+            self._count_log_entry(new_row['Style'], new_row['Script_Length'], new_row['Word_Count'])
             
-            # Sort by Date and Time (most recent first)
-            new_df['DateTime'] = pd.to_datetime(new_df['Date'] + ' ' + new_df['Time'])
-            new_df = new_df.sort_values('DateTime', ascending=False).drop('DateTime', axis=1)
+            if not export_excel:
+                self._append_log_entry(new_row)
+                print(f"✅ Content logged to: {self.log_path}")
+                return self.log_path
             
-            # Save to Excel
-            with pd.ExcelWriter(filename, engine='openpyxl', mode='w') as writer:
-                new_df.to_excel(writer, sheet_name='Content_Log', index=False, header=True)
-                
-                # Create summary sheet
-                summary_data = pd.DataFrame({
-                    'Metric': [
-                        'Total Entries', 'Last Updated', 'Most Used Style', 
-                        'Average Script Length', 'Total Words Generated'
-                    ],
-                    'Value': [
-                        len(new_df),
-                        current_time.strftime('%Y-%m-%d %H:%M:%S'),
-                        new_df['Style'].mode().iloc[0] if len(new_df) > 0 else 'None',
-                        f"{new_df['Script_Length'].mean():.0f} characters" if len(new_df) > 0 else '0',
-                        new_df['Word_Count'].sum() if len(new_df) > 0 else 0
-                    ]
-                })
-                summary_data.to_excel(writer, sheet_name='Summary', index=False)
-                
-                # Major Headlines tab
-                major_headlines = self.get_major_headlines(limit=20)
-                if major_headlines:
-                    headlines_data = []
-                    for i, headline in enumerate(major_headlines, 1):
-                        time_pub = headline.get('time_published', '')
-                        formatted_time = ""
-                        if time_pub and len(time_pub) >= 8:
-                            formatted_time = f"{time_pub[4:6]}/{time_pub[6:8]} {time_pub[9:11]}:{time_pub[11:13]}"
-                        
-                        headlines_data.append({
-                            'Rank': i,
-                            'Title': headline['title'],
-                            'Source': headline['source'],
-                            'Time': formatted_time,
-                            'Sentiment': headline['sentiment'].title(),
-                            'Score': round(headline['sentiment_score'], 3),
-                            'Tickers': ', '.join(headline.get('tickers', [])),
-                            'Summary': headline.get('summary', '')[:200] + "..." if len(headline.get('summary', '')) > 200 else headline.get('summary', ''),
-                        })
-                    
-                    headlines_df = pd.DataFrame(headlines_data)
-                    headlines_df.to_excel(writer, sheet_name='Major_Headlines', index=False)
+            cols = self._cols
+            stats = self._stats
+            total_entries = stats['count']
+            total_length = stats['sum_len']
+            total_words = stats['sum_words']
+            if self.debug_mode:
+                print(f"📄 {'Updating existing' if os.path.exists(filename) else 'Creating new'} file: {filename}")
+                print(f"📊 Entries in log: {total_entries}")
+            
+            # Ties go to the alphabetically first style
+            most_used_style = 'None'
+            if stats['style_counts']:
+                top_count = max(stats['style_counts'].values())
+                most_used_style = min(style for style, count in stats['style_counts'].items() if count == top_count)
+            
+            # Rows are already in time order, so reversing gives most recent first without a sort
+            sheets = {
+                'Content_Log': [_CONTENT_LOG_COLUMNS, *zip(*(reversed(cols[name]) for name in _CONTENT_LOG_COLUMNS))],
+                'Summary': [
+                    ['Metric', 'Value'],
+                    ['Total Entries', total_entries],
+                    ['Last Updated', current_time.strftime('%Y-%m-%d %H:%M:%S')],
+                    ['Most Used Style', most_used_style],
+                    ['Average Script Length', f"{total_length / total_entries:.0f} characters" if total_entries else '0'],
+                    ['Total Words Generated', total_words]
+                ]
+            }
+            
+            # Major Headlines tab
+            major_headlines = self._headlines_cached(20)
+            if major_headlines:
+                # The headlines list is reused for five minutes, so repeat saves usually render the same sheet
+                fingerprint = hash(tuple(
+                    (h['title'], h['source'], h.get('time_published', ''), h['sentiment'], h['sentiment_score'],
+                     tuple(h.get('tickers', [])), h.get('summary', ''))
+                    for h in major_headlines
+                ))
+                if fingerprint != self._headlines_fp:
+                    # Build each column with one list comprehension, then zip them into rows
+                    times = [f"{tp[4:6]}/{tp[6:8]} {tp[9:11]}:{tp[11:13]}" if len(tp := h.get('time_published', '')) >= 8 else ""
+                             for h in major_headlines]
+                    summaries = [text[:200] + "..." if len(text := h.get('summary', '')) > 200 else text for h in major_headlines]
+                    columns = {
+                        'Rank': range(1, len(major_headlines) + 1),
+                        'Title': [h['title'] for h in major_headlines],
+                        'Source': [h['source'] for h in major_headlines],
+                        'Time': times,
+                        'Sentiment': [h['sentiment'].title() for h in major_headlines],
+                        'Score': [round(h['sentiment_score'], 3) for h in major_headlines],
+                        'Tickers': [', '.join(h.get('tickers', ())) for h in major_headlines],
+                        'Summary': summaries
+                    }
+                    rows = [list(columns), *zip(*columns.values())]
+                    self._headlines_xml = _xlsx_sheet_xml(rows).encode('utf-8')
+                    self._headlines_fp = fingerprint
+                sheets['Major_Headlines'] = self._headlines_xml
+            
+            _write_xlsx_raw(filename, sheets, {'Content_Log': _SHARED_LOG_COLUMNS})
+            # Logged only once the workbook is written, so a failed save can be retried without a duplicate entry
+            self._append_log_entry(new_row)
             
             print(f"✅ Content saved to: {filename}")
             return filename
             
         except Exception as e:
+            # The in-memory entry may not have reached the log; reload from disk on the next save
+            self._cols = None
             print(f"❌ Error updating Excel file: {e}")
             return ""
 
+    def _append_log_entry(self, row: Dict[str, Any]) -> None:
+        """Append one entry to the JSONL log - one line however long the log has grown"""
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self._log_seen = self._log_signature()
+
+    def _log_signature(self) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of the JSONL log, or None if it doesn't exist yet"""
+        try:
+            st = os.stat(self.log_path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _count_log_entry(self, style: Optional[str], length: Optional[int], words: Optional[int]) -> None:
+        """Fold one Content_Log entry into the running Summary aggregates"""
+        stats = self._stats
+        stats['count'] += 1
+        stats['sum_len'] += length or 0
+        stats['sum_words'] += words or 0
+        if style is not None:
+            stats['style_counts'][style] += 1
+
+    def _read_content_log(self) -> Dict[str, List[Any]]:
+        """Load the JSONL log as Content_Log columns, oldest first"""
+        if pl is not None:
+            # Native NDJSON reader; one to_list() per column instead of a json parse per line
+            schema = {name: pl.Int64 if name in _NUMERIC_LOG_COLUMNS else pl.Utf8 for name in _CONTENT_LOG_COLUMNS}
+            df = pl.read_ndjson(self.log_path, schema=schema)
+            return {name: df[name].to_list() for name in _CONTENT_LOG_COLUMNS}
+        
+        cols = _empty_log_columns()
+        with open(self.log_path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = _json_loads(line)
+                    for name, values in cols.items():
+                        values.append(entry.get(name))
+        return cols
+
+    def _import_excel_log(self, filename: str) -> None:
+        """Copy an existing tracker's Content_Log (stored newest first) into the JSONL log.
+
+        Columns are matched by header name, so older trackers missing e.g. Style or
+        Motion_Script import with those fields empty. A tracker that can't be read is
+        moved aside rather than left to be overwritten by the next save.
+        """
+        try:
+            wb = load_workbook(filename, read_only=True)
+            try:
+                rows = wb['Content_Log'].iter_rows(values_only=True)
+                positions = {name: i for i, name in enumerate(next(rows, ())) if name in _CONTENT_LOG_COLUMNS}
+                if not positions:
+                    raise ValueError("no recognised Content_Log columns")
+                entries = [
+                    {name: row[positions[name]] if positions.get(name, len(row)) < len(row) else None
+                     for name in _CONTENT_LOG_COLUMNS}
+                    for row in rows if any(value is not None for value in row)
+                ]
+            finally:
+                wb.close()
+        except Exception as e:
+            backup = f"{filename}.{datetime.now().strftime('%Y%m%d%H%M%S')}.bak"
+            os.replace(filename, backup)
+            print(f"⚠️ Could not read existing file ({e}), moved it to {backup} and creating new structure")
+            return
+        
+        # Serialize everything before touching the log (date cells become strings), then swap it in whole
+        lines = [json.dumps(entry, ensure_ascii=False, default=str) + "\n" for entry in reversed(entries)]
+        tmp_path = self.log_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+        os.replace(tmp_path, self.log_path)
+        print(f"📄 Imported {len(entries)} entries from {filename} into {self.log_path}")
 
 def main():
+    # Consoles without emoji glyphs (cp1252 on Windows) print a placeholder instead of raising
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(errors='replace')
+    
     print("=== Enhanced Alpha Vantage News Generator with Style Selection ===")
     print("📋 Checking dependencies...")
     
     # Check optional dependencies
-    try:
-        import yfinance
+    if yf is not None:
         print("✅ yfinance available")
-    except ImportError:
+    else:
         print("⚠️ yfinance not installed - market data will be limited")
         print("   Install with: pip install yfinance")
     
@@ -1406,31 +2021,15 @@ def main():
             # Generate content with selected style
             content = generator.generate_content(style_key=selected_style)
             
-            # Display results
-            print("\n" + "="*60)
-            print(f"📺 GENERATED SCRIPT ({content['style']}):")
-            print("="*60)
-            print(content['script'])
-            
-            print("\n" + "="*60)
-            print("📱 SOCIAL MEDIA POST:")
-            print("="*60)
-            print(content['social_post'])
-            
-            print("\n" + "="*60)
-            print("🎬 MOTION SCRIPT:")
-            print("="*60)
-            print(content['motion_script'])
-            
-            print("\n" + "="*60)
-            print("📺 VIDEO CAPTION:")
-            print("="*60)
-            print(content['video_caption'])
-            
-            print("\n" + "="*60)
-            print("🎯 EPISODE TITLE:")
-            print("="*60)
-            print(content['episode_title'])
+            # Display results as one write rather than a print per line
+            sections = [
+                (f"📺 GENERATED SCRIPT ({content['style']}):", content['script']),
+                ("📱 SOCIAL MEDIA POST:", content['social_post']),
+                ("🎬 MOTION SCRIPT:", content['motion_script']),
+                ("📺 VIDEO CAPTION:", content['video_caption']),
+                ("🎯 EPISODE TITLE:", content['episode_title'])
+            ]
+            print("\n".join(f"\n{'='*60}\n{heading}\n{'='*60}\n{body}" for heading, body in sections))
             
             if choice == "3":
                 # Also show headlines
@@ -1452,8 +2051,9 @@ def main():
             print(f"Day: {content['day']}")
             print(f"Type: {content['type']}")
             print(f"News articles processed: {content['news_count']}")
-            print(f"Script length: {len(content['script'])} characters")
-            print(f"Word count: {len(content['script'].split())} words")
+            script_len, word_count = generator.script_stats(content)
+            print(f"Script length: {script_len} characters")
+            print(f"Word count: {word_count} words")
             print(f"Motion script length: {len(content['motion_script'])} characters")
             print(f"API calls made: {generator.call_count}")
         
@@ -1,6 +1,8 @@
 import streamlit as st
 import os
-from datetime import datetime
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
 from dotenv import load_dotenv
 import warnings
 warnings.filterwarnings("ignore", message="No secrets found")
@@ -14,8 +16,12 @@ st.set_page_config(
 )
 
 # --- Load API Keys ---
+@st.cache_resource
 def load_api_keys():
-    """Load API keys from Streamlit secrets or .env file"""
+    """Load API keys from Streamlit secrets or .env file and export them to the environment.
+
+    Cached per server process, so reruns skip the secrets probes and the .env lookup.
+    """
     alpha_vantage_key = None
     openai_key = None
     
@@ -25,37 +31,82 @@ def load_api_keys():
             try:
                 alpha_vantage_key = st.secrets.get("ALPHA_VANTAGE_API_KEY")
                 openai_key = st.secrets.get("OPENAI_API_KEY")
-                
-                if alpha_vantage_key and openai_key:
-                    return alpha_vantage_key, openai_key
             except Exception:
                 pass
     except Exception:
         pass
     
-    # Fallback to .env file (for local development)
-    load_dotenv()
-    alpha_vantage_key = os.getenv("ALPHA_VANTAGE_API_KEY")
-    openai_key = os.getenv("OPENAI_API_KEY")
+    if not (alpha_vantage_key and openai_key):
+        # Fallback to .env file (for local development)
+        load_dotenv()
+        alpha_vantage_key = os.getenv("ALPHA_VANTAGE_API_KEY")
+        openai_key = os.getenv("OPENAI_API_KEY")
     
-    return alpha_vantage_key, openai_key
+    if alpha_vantage_key and openai_key:
+        os.environ["ALPHA_VANTAGE_API_KEY"] = alpha_vantage_key
+        os.environ["OPENAI_API_KEY"] = openai_key
+        return alpha_vantage_key, openai_key, True
+    return alpha_vantage_key, openai_key, False
 
 # --- Load and Set API Keys ---
 try:
-    alpha_key, openai_key = load_api_keys()
-    
-    if alpha_key and openai_key:
-        os.environ["ALPHA_VANTAGE_API_KEY"] = alpha_key
-        os.environ["OPENAI_API_KEY"] = openai_key
-        api_keys_loaded = True
-    else:
-        api_keys_loaded = False
+    alpha_key, openai_key, api_keys_loaded = load_api_keys()
+    if not api_keys_loaded:
+        # Don't hold on to a miss, so keys added while the app runs are picked up
+        load_api_keys.clear()
         
 except Exception as e:
     st.error(f"Error loading API keys: {e}")
     api_keys_loaded = False
 
 # --- Helper Functions ---
+# Case-insensitive, so headline text is never lowercased; 'goldman' also covers 'goldman sachs'
+_GOLD_RE = re.compile(r'gold', re.IGNORECASE)
+_GOLDMAN_RE = re.compile(r'goldman|gs group', re.IGNORECASE)
+_CRYPTO_RE = re.compile(r'bitcoin|btc|crypto|ethereum', re.IGNORECASE)
+
+def _classify(headline, today):
+    """(icon, formatted time, age indicator) for a headline"""
+    # Format timestamp and age
+    time_pub = headline.get('time_published', '')
+    age_indicator = ""
+    formatted_time = "Recent"
+    
+    if time_pub and len(time_pub) >= 8:
+        try:
+            # Fixed YYYYMMDD prefix, so slice it rather than run strptime
+            days_ago = (today - date(int(time_pub[:4]), int(time_pub[4:6]), int(time_pub[6:8]))).days
+            
+            if days_ago == 0:
+                formatted_time = f"{time_pub[4:6]}/{time_pub[6:8]} {time_pub[9:11]}:{time_pub[11:13]}"
+            elif days_ago == 1:
+                formatted_time = f"Yesterday {time_pub[9:11]}:{time_pub[11:13]}"
+                age_indicator = " 📅"
+            elif days_ago <= 7:
+                formatted_time = f"{days_ago}d ago {time_pub[9:11]}:{time_pub[11:13]}"
+                age_indicator = " 📅"
+        except:
+            pass
+    
+    # Determine icon with proper gold filtering; the newline keeps matches from spanning title and summary
+    text = f"{headline.get('title', '')}\n{headline.get('summary', '')}"
+    
+    # Check for actual gold (not Goldman Sachs)
+    is_gold_news = bool(_GOLD_RE.search(text)) and not _GOLDMAN_RE.search(text)
+
+    if is_gold_news:
+        icon = "🥇"
+    elif _CRYPTO_RE.search(text):
+        icon = "₿"
+    elif headline.get('sentiment') == 'bullish':
+        icon = "📈"
+    elif headline.get('sentiment') == 'bearish':
+        icon = "📉"
+    else:
+        icon = "📊"
+    
+    return icon, formatted_time, age_indicator
+
 def _display_headlines():
     """Display headlines in Streamlit format"""
     headlines = st.session_state.headlines
@@ -66,71 +117,47 @@ def _display_headlines():
     
     st.caption(f"Found {len(headlines)} major headlines (🥇 Gold | ₿ Bitcoin/Crypto | 📅 Previous days)")
     
+    # One markdown element for the whole list rather than one per headline
+    parts = []
+    today = datetime.now().date()
     for i, headline in enumerate(headlines, 1):
-        # Format timestamp and age
-        time_pub = headline.get('time_published', '')
-        age_indicator = ""
-        formatted_time = "Recent"
+        # Classified on first display and kept on the session's headline dicts, so reruns skip it
+        if '_icon' not in headline:
+            headline['_icon'], headline['_formatted_time'], headline['_age_indicator'] = _classify(headline, today)
+        icon = headline['_icon']
+        formatted_time = headline['_formatted_time']
+        age_indicator = headline['_age_indicator']
         
-        if time_pub and len(time_pub) >= 8:
-            try:
-                pub_date = datetime.strptime(time_pub[:8], '%Y%m%d')
-                today = datetime.now().date()
-                days_ago = (today - pub_date.date()).days
-                
-                if days_ago == 0:
-                    formatted_time = f"{time_pub[4:6]}/{time_pub[6:8]} {time_pub[9:11]}:{time_pub[11:13]}"
-                elif days_ago == 1:
-                    formatted_time = f"Yesterday {time_pub[9:11]}:{time_pub[11:13]}"
-                    age_indicator = " 📅"
-                elif days_ago <= 7:
-                    formatted_time = f"{days_ago}d ago {time_pub[9:11]}:{time_pub[11:13]}"
-                    age_indicator = " 📅"
-            except:
-                pass
+        summary = headline.get('summary', '')
+        tickers = headline.get('tickers')
         
         # Format tickers
         tickers_display = ""
-        if headline.get('tickers'):
-            tickers_display = f" [{', '.join(headline['tickers'][:3])}]"
-        
-        # Determine icon with proper gold filtering
-        title_lower = headline.get('title', '').lower()
-        summary_lower = headline.get('summary', '').lower()
+        if tickers:
+            tickers_display = f" [{', '.join(tickers[:3])}]"
         
-        # Check for actual gold (not Goldman Sachs)
-        is_gold_news = False
-        if 'gold' in title_lower or 'gold' in summary_lower:
-            goldman_terms = ['goldman sachs', 'goldman', 'gs group']
-            if not any(term in title_lower or term in summary_lower for term in goldman_terms):
-                is_gold_news = True
-
-        if is_gold_news:
-            icon = "🥇"
-        elif any(term in title_lower or term in summary_lower for term in ['bitcoin', 'btc', 'crypto', 'ethereum']):
-            icon = "₿"
-        elif headline.get('sentiment') == 'bullish':
-            icon = "📈"
-        elif headline.get('sentiment') == 'bearish':
-            icon = "📉"
-        else:
-            icon = "📊"
-        
-        # Display headline
-        with st.container():
-            st.markdown(f"""
-            <div class="headline-item">
-                <div class="headline-title">{i:2d}. {headline['title']}{tickers_display}{age_indicator}</div>
-                <div class="headline-meta">{icon} {headline.get('sentiment', 'neutral').title()} | {headline.get('source', 'Unknown')} | {formatted_time}</div>
-                <div class="headline-summary">{headline.get('summary', '')[:150]}{'...' if len(headline.get('summary', '')) > 150 else ''}</div>
-            </div>
-            """, unsafe_allow_html=True)
+        summary_short = summary[:150] + "..." if len(summary) > 150 else summary
+        parts.append(
+            f'<div class="headline-item">'
+            f'<div class="headline-title">{i:2d}. {headline["title"]}{tickers_display}{age_indicator}</div>'
+            f'<div class="headline-meta">{icon} {headline.get("sentiment", "neutral").title()} | {headline.get("source", "Unknown")} | {formatted_time}</div>'
+            f'<div class="headline-summary">{summary_short}</div>'
+            f'</div>'
+        )
+    
+    st.markdown("".join(parts), unsafe_allow_html=True)
 
 
 # --- Import the News Generator Class ---
+@st.cache_resource
+def load_generator_class():
+    """Import the generator module once per server process rather than on every rerun"""
+    from alpha_news_chill import ProfessionalNewsGenerator
+    return ProfessionalNewsGenerator
+
 try:
     if api_keys_loaded:
-        from alpha_news_chill import ProfessionalNewsGenerator
+        ProfessionalNewsGenerator = load_generator_class()
         import_success = True
     else:
         import_success = False
@@ -142,8 +169,46 @@ except Exception as e:
     st.error(f"Error importing class: {e}")
     import_success = False
 
+@st.cache_resource
+def get_generator(debug_mode=False):
+    """One generator per server process, reused by every button, rerun and session; run state is kept per thread"""
+    return ProfessionalNewsGenerator(debug_mode=debug_mode)
+
+@st.cache_resource
+def get_headlines_generator():
+    """Separate instance, with its own HTTP session and counters, so headline fetches can run beside generation"""
+    return ProfessionalNewsGenerator(debug_mode=False)
+
+def generate_content(style_key):
+    return get_generator().generate_content(style_key=style_key)
+
+def fetch_headlines():
+    return get_headlines_generator().get_major_headlines()
+
+def save_content(content):
+    # Only ever runs on the single save worker, which keeps writes to the tracker in order
+    return get_generator().save_to_excel(content)
+
+@st.cache_resource
+def get_save_pool():
+    """Background writer for Excel saves; one worker, so saves to the shared tracker never overlap"""
+    return ThreadPoolExecutor(max_workers=1)
+
+@st.cache_data
+def get_styles():
+    """Style catalogue for the selector; it never changes while the app runs"""
+    return get_generator().get_available_styles()
+
+@st.cache_data
+def get_style_options():
+    """(selector label -> style key, style catalogue), formatted once rather than on every rerun"""
+    styles = get_styles()
+    return {f"{info['name']} ({info['target_seconds']}s)": key for key, info in styles.items()}, styles
+
 # --- App Styling ---
-st.markdown("""
+# Plain literal, nothing formatted per run. A full run clears elements it doesn't emit,
+# so the stylesheet is sent on every full run; the panel fragments' reruns skip it
+_APP_CSS = """
     <style>
         .stButton>button {
             border: 2px solid #007bff;
@@ -230,7 +295,9 @@ st.markdown("""
             margin: 10px 0;
         }
     </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(_APP_CSS, unsafe_allow_html=True)
 
 # --- Session State Initialization ---
 if 'content' not in st.session_state:
@@ -272,10 +339,23 @@ if not import_success:
     </div>
     """, unsafe_allow_html=True)
 
-# --- Main Layout ---
-col1, col2 = st.columns([1, 3])
+# --- Control Panel ---
+@st.fragment(run_every=1)
+def _await_save():
+    """Poll the running save; a full rerun swaps this for the result once it finishes"""
+    # Generate and Clear drop the pending save, possibly between polls
+    fut = st.session_state.get('save_future')
+    if fut is None:
+        return
+    if fut.done():
+        st.rerun()
+    st.info("💾 Saving to Excel...")
 
-with col1:
+
+# Panels are fragments, so a widget inside one reruns only that panel; buttons that
+# change what the other panel shows still call st.rerun() for a full-page pass
+@st.fragment
+def control_panel():
     with st.container(border=True):
         st.subheader("Control Panel")
         
@@ -297,18 +377,18 @@ with col1:
 
         st.divider()
 
+        # Set once the shared generator is up; the buttons below stay disabled until it is
+        generator = None
+        available_styles = {}
+        
         # Style Selection Section
         if api_keys_loaded and import_success:
             st.markdown('<div class="style-selector">', unsafe_allow_html=True)
             st.subheader("🎨 Content Style")
             
             try:
-                generator = ProfessionalNewsGenerator()
-                available_styles = generator.get_available_styles()
-                
-                style_options = {}
-                for key, info in available_styles.items():
-                    style_options[f"{info['name']} ({info['target_seconds']}s)"] = key
+                generator = get_generator()
+                style_options, available_styles = get_style_options()
                 
                 selected_display = st.selectbox(
                     "Choose presentation style:",
@@ -333,15 +413,15 @@ with col1:
         st.divider()
 
         # Generation Buttons
-        generate_disabled = not (api_keys_loaded and import_success)
+        generate_disabled = generator is None
         
         if st.button("🚀 Generate Today's Content", disabled=generate_disabled):
             if not generate_disabled:
                 with st.spinner(f'Generating content in {available_styles[st.session_state.selected_style]["name"]} style...'):
                     try:
-                        generator = ProfessionalNewsGenerator(debug_mode=False)
-                        st.session_state.content = generator.generate_content(style_key=st.session_state.selected_style)
+                        st.session_state.content = generate_content(st.session_state.selected_style)
                         st.session_state.generation_complete = True
+                        st.session_state.pop('save_future', None)
                         st.session_state.last_generated_time = datetime.now().strftime("%H:%M:%S")
                         st.rerun() 
                     except Exception as e:
@@ -353,8 +433,7 @@ with col1:
             if not generate_disabled:
                 with st.spinner('Fetching major headlines...'):
                     try:
-                        generator = ProfessionalNewsGenerator(debug_mode=False)
-                        headlines = generator.get_major_headlines()
+                        headlines = fetch_headlines()
                         st.session_state.headlines = headlines
                         st.session_state.headlines_loaded = True
                         st.rerun()
@@ -367,10 +446,15 @@ with col1:
             if not generate_disabled:
                 with st.spinner(f'Generating content and headlines in {available_styles[st.session_state.selected_style]["name"]} style...'):
                     try:
-                        generator = ProfessionalNewsGenerator(debug_mode=False)
-                        st.session_state.content = generator.generate_content(style_key=st.session_state.selected_style)
-                        st.session_state.headlines = generator.get_major_headlines()
+                        # Both are network-bound, so fetch the headlines while the script is generated;
+                        # the two calls go to different generator instances and never share state
+                        with ThreadPoolExecutor(max_workers=2) as pool:
+                            content_future = pool.submit(generate_content, st.session_state.selected_style)
+                            headlines_future = pool.submit(fetch_headlines)
+                            st.session_state.content = content_future.result()
+                            st.session_state.headlines = headlines_future.result()
                         st.session_state.generation_complete = True
+                        st.session_state.pop('save_future', None)
                         st.session_state.headlines_loaded = True
                         st.session_state.last_generated_time = datetime.now().strftime("%H:%M:%S")
                         st.rerun()
@@ -382,20 +466,31 @@ with col1:
                         st.session_state.headlines_loaded = False
 
         # Action Buttons
-        if (st.session_state.generation_complete and st.session_state.content and import_success):
+        if (st.session_state.generation_complete and st.session_state.content and generator is not None):
             if st.button("💾 Save to Excel"):
-                with st.spinner("Saving to Excel..."):
-                    try:
-                        generator = ProfessionalNewsGenerator()
-                        filename = generator.save_to_excel(st.session_state.content)
+                # Written off the script thread so the page stays responsive during the save
+                st.session_state.save_future = get_save_pool().submit(save_content, st.session_state.content)
+            
+            save_future = st.session_state.get('save_future')
+            if save_future is not None and not save_future.done():
+                _await_save()
+            elif save_future is not None:
+                try:
+                    filename = save_future.result()
+                except Exception as e:
+                    st.error(f"Failed to save: {e}")
+                else:
+                    # save_to_excel reports its own errors and returns "" instead of raising
+                    if not filename:
+                        st.error("Failed to save: the Excel tracker could not be written (see the server log)")
+                    else:
                         st.success(f"Content saved to `{filename}`")
                         st.info("Excel file includes Major_Headlines tab with Gold/Bitcoin coverage")
                         if 'style' in st.session_state.content:
                             st.info(f"Style information saved: {st.session_state.content['style']}")
-                    except Exception as e:
-                        st.error(f"Failed to save: {e}")
             
         if st.button("🧹 Clear Results", type="secondary"):
+            st.session_state.pop('save_future', None)
             st.session_state.content = None
             st.session_state.headlines = None
             st.session_state.generation_complete = False
@@ -404,49 +499,57 @@ with col1:
             st.rerun()
 
 # --- Display Results ---
-with col2:
+# (tab label, widget label, content field, widget key, widget, text area height)
+CONTENT_TABS = (
+    ("🎙️ Script", "Voice Script for Presenter", "script", "script_area", st.text_area, 250),
+    ("📱 Social", "Social Media Post", "social_post", "social_area", st.text_area, 200),
+    ("🎬 Motion", "Motion Script (for Presenter)", "motion_script", "motion_area", st.text_area, 150),
+    ("📺 Caption", "Video Caption", "video_caption", "caption_input", st.text_input, None),
+    ("🎯 Title", "Episode Title", "episode_title", "title_input", st.text_input, None)
+)
+
+@st.fragment
+def render_content_tabs(content, show_note=False):
+    """Metrics row plus the five content tabs, shared by both result layouts"""
+    # Content Info with Style
+    col_info1, col_info2, col_info3, col_info4 = st.columns(4)
+    with col_info1:
+        st.metric("Type", content.get('type', 'N/A'))
+    with col_info2:
+        st.metric("Day", content.get('day', 'N/A'))
+    with col_info3:
+        st.metric("Articles", content.get('news_count', 0))
+    with col_info4:
+        st.metric("Style", content.get('style', 'Classic Daily Brief'))
+    
+    if show_note:
+        st.info("ℹ️ The script below is generated from the most recent news. For a broader high impact news view, please see the 'Major Headlines' tab.")
+    
+    # Content Tabs
+    tabs = st.tabs([tab_label for tab_label, *_ in CONTENT_TABS])
+    for tab, (_, label, field, key, widget, height) in zip(tabs, CONTENT_TABS):
+        with tab:
+            text = content.get(field, '')
+            if height:
+                widget(label, value=text, height=height, key=key)
+            else:
+                widget(label, value=text, key=key)
+            if not text:
+                continue
+            if field == 'script':
+                script_len, word_count = ProfessionalNewsGenerator.script_stats(content)
+                st.caption(f"📝 {script_len} characters | {word_count} words | Style: {content.get('style', 'N/A')}")
+            elif field == 'social_post':
+                st.caption(f"📱 {len(text)} characters")
+
+@st.fragment
+def results_panel():
     if st.session_state.content and st.session_state.headlines:
         # Both content and headlines
         tab1, tab2 = st.tabs(["📺 Generated Content", "📰 Major Headlines"])
         
         with tab1:
-            content = st.session_state.content
-            
-            # Content Info with Style
-            col_info1, col_info2, col_info3, col_info4 = st.columns(4)
-            with col_info1:
-                st.metric("Type", content.get('type', 'N/A'))
-            with col_info2:
-                st.metric("Day", content.get('day', 'N/A'))
-            with col_info3:
-                st.metric("Articles", content.get('news_count', 0))
-            with col_info4:
-                st.metric("Style", content.get('style', 'Classic Daily Brief'))
-            
-            # Content Tabs
-            subtab1, subtab2, subtab3, subtab4, subtab5 = st.tabs(["🎙️ Script", "📱 Social", "🎬 Motion", "📺 Caption", "🎯 Title"])
-
-            with subtab1:
-                script_text = content.get('script', '')
-                st.text_area("Voice Script for Presenter", value=script_text, height=250, key="script_area")
-                if script_text:
-                    st.caption(f"📝 {len(script_text)} characters | {len(script_text.split())} words | Style: {content.get('style', 'N/A')}")
-
-            with subtab2:
-                social_text = content.get('social_post', '')
-                st.text_area("Social Media Post", value=social_text, height=200, key="social_area")
-                if social_text:
-                    st.caption(f"📱 {len(social_text)} characters")
-
-            with subtab3:
-                motion_text = content.get('motion_script', '')
-                st.text_area("Motion Script (for Presenter)", value=motion_text, height=150, key="motion_area")
-
-            with subtab4:
-                st.text_input("Video Caption", value=content.get('video_caption', ''), key="caption_input")
-
-            with subtab5:
-                st.text_input("Episode Title", value=content.get('episode_title', ''), key="title_input")
+            render_content_tabs(st.session_state.content)
         
         with tab2:
             st.subheader("📰 Major Market Headlines")
@@ -455,45 +558,7 @@ with col2:
     elif st.session_state.content:
         # Content only
         st.subheader("📺 Generated Content")
-        content = st.session_state.content
-        
-        # Content Info with Style
-        col_info1, col_info2, col_info3, col_info4 = st.columns(4)
-        with col_info1:
-            st.metric("Type", content.get('type', 'N/A'))
-        with col_info2:
-            st.metric("Day", content.get('day', 'N/A'))
-        with col_info3:
-            st.metric("Articles", content.get('news_count', 0))
-        with col_info4:
-            st.metric("Style", content.get('style', 'Classic Daily Brief'))
-        
-        st.info("ℹ️ The script below is generated from the most recent news. For a broader high impact news view, please see the 'Major Headlines' tab.")
-        
-        # Content Tabs
-        tab1, tab2, tab3, tab4, tab5 = st.tabs(["🎙️ Script", "📱 Social", "🎬 Motion", "📺 Caption", "🎯 Title"])
-
-        with tab1:
-            script_text = content.get('script', '')
-            st.text_area("Voice Script for Presenter", value=script_text, height=250, key="script_area")
-            if script_text:
-                st.caption(f"📝 {len(script_text)} characters | {len(script_text.split())} words | Style: {content.get('style', 'N/A')}")
-
-        with tab2:
-            social_text = content.get('social_post', '')
-            st.text_area("Social Media Post", value=social_text, height=200, key="social_area")
-            if social_text:
-                st.caption(f"📱 {len(social_text)} characters")
-
-        with tab3:
-            motion_text = content.get('motion_script', '')
-            st.text_area("Motion Script (for Presenter)", value=motion_text, height=150, key="motion_area")
-
-        with tab4:
-            st.text_input("Video Caption", value=content.get('video_caption', ''), key="caption_input")
-
-        with tab5:
-            st.text_input("Episode Title", value=content.get('episode_title', ''), key="title_input")
+        render_content_tabs(st.session_state.content, show_note=True)
     
     elif st.session_state.headlines:
         # Headlines only
@@ -519,6 +584,15 @@ with col2:
         else:
             st.warning("Please fix the configuration issues shown above before generating content.")
 
+# --- Main Layout ---
+col1, col2 = st.columns([1, 3])
+
+with col1:
+    control_panel()
+
+with col2:
+    results_panel()
+
 # --- Footer ---
 st.divider()
 col1, col2 = st.columns(2)